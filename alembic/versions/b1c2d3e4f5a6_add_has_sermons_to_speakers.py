@@ -0,0 +1,39 @@
+"""add_has_sermons_to_speakers
+
+Revision ID: b1c2d3e4f5a6
+Revises: 7d488b46c1e7
+Create Date: 2025-10-12 14:05:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c2d3e4f5a6'
+down_revision: Union[str, Sequence[str], None] = '7d488b46c1e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Denormalized flag so "speakers with sermons" is an index scan instead of JOIN + DISTINCT
+    op.add_column('speakers', sa.Column('has_sermons', sa.Boolean(), nullable=False, server_default='false'))
+    op.execute(
+        "UPDATE speakers SET has_sermons = EXISTS "
+        "(SELECT 1 FROM sermons WHERE sermons.speaker_id = speakers.id)"
+    )
+    op.create_index(op.f('ix_speakers_has_sermons'), 'speakers', ['has_sermons'], unique=False)
+    
+    print("✅ Added has_sermons column to speakers table successfully!")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_speakers_has_sermons'), table_name='speakers')
+    op.drop_column('speakers', 'has_sermons')
+    
+    print("✅ Removed has_sermons column from speakers table successfully!")
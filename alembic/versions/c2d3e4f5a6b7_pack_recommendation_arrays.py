@@ -0,0 +1,75 @@
+"""pack_recommendation_arrays
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2025-10-13 11:42:08.913554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d3e4f5a6b7'
+down_revision: Union[str, Sequence[str], None] = 'b1c2d3e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match PackedArray in app/db/models.py: little-endian int32 ids / float32 scores
+SPEAKER_IDS_DTYPE = np.dtype('<i4')
+SCORES_DTYPE = np.dtype('<f4')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    
+    op.add_column('recommendations', sa.Column('speaker_ids_packed', sa.LargeBinary(), nullable=True))
+    op.add_column('recommendations', sa.Column('scores_packed', sa.LargeBinary(), nullable=True))
+    
+    rows = connection.execute(sa.text("SELECT id, speaker_ids, scores FROM recommendations")).fetchall()
+    for row in rows:
+        connection.execute(
+            sa.text("UPDATE recommendations SET speaker_ids_packed = :speaker_ids, scores_packed = :scores WHERE id = :id"),
+            {
+                "id": row.id,
+                "speaker_ids": np.asarray(row.speaker_ids or [], dtype=SPEAKER_IDS_DTYPE).tobytes(),
+                "scores": np.asarray(row.scores, dtype=SCORES_DTYPE).tobytes() if row.scores is not None else None,
+            }
+        )
+    
+    op.drop_column('recommendations', 'speaker_ids')
+    op.drop_column('recommendations', 'scores')
+    op.alter_column('recommendations', 'speaker_ids_packed', new_column_name='speaker_ids', nullable=False)
+    op.alter_column('recommendations', 'scores_packed', new_column_name='scores')
+    
+    print(f"✅ Packed speaker_ids/scores into bytea for {len(rows)} recommendation rows")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    
+    op.add_column('recommendations', sa.Column('speaker_ids_json', sa.JSON(), nullable=True))
+    op.add_column('recommendations', sa.Column('scores_json', sa.JSON(), nullable=True))
+    
+    rows = connection.execute(sa.text("SELECT id, speaker_ids, scores FROM recommendations")).fetchall()
+    update = sa.text(
+        "UPDATE recommendations SET speaker_ids_json = :speaker_ids, scores_json = :scores WHERE id = :id"
+    ).bindparams(sa.bindparam("speaker_ids", type_=sa.JSON()), sa.bindparam("scores", type_=sa.JSON()))
+    for row in rows:
+        connection.execute(update, {
+            "id": row.id,
+            "speaker_ids": np.frombuffer(row.speaker_ids, dtype=SPEAKER_IDS_DTYPE).tolist(),
+            "scores": np.frombuffer(row.scores, dtype=SCORES_DTYPE).tolist() if row.scores is not None else None,
+        })
+    
+    op.drop_column('recommendations', 'speaker_ids')
+    op.drop_column('recommendations', 'scores')
+    op.alter_column('recommendations', 'speaker_ids_json', new_column_name='speaker_ids', nullable=False)
+    op.alter_column('recommendations', 'scores_json', new_column_name='scores')
+    
+    print("✅ Restored JSON speaker_ids/scores on recommendations")
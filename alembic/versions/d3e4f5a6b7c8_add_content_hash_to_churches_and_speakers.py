@@ -0,0 +1,35 @@
+"""add_content_hash_to_churches_and_speakers
+
+Revision ID: d3e4f5a6b7c8
+Revises: c2d3e4f5a6b7
+Create Date: 2025-10-14 09:27:44.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e4f5a6b7c8'
+down_revision: Union[str, Sequence[str], None] = 'c2d3e4f5a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Hash of the CSV row each record was last loaded from; NULL until the next load writes it
+    op.add_column('churches', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    op.add_column('speakers', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    
+    print("✅ Added content_hash column to churches and speakers tables successfully!")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('speakers', 'content_hash')
+    op.drop_column('churches', 'content_hash')
+    
+    print("✅ Removed content_hash column from churches and speakers tables successfully!")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from app.db.database import get_db
 from app.db import models
@@ -16,7 +16,7 @@ def get_churches(
     db: Session = Depends(get_db)
 ):
     """Get all churches with optional filtering"""
-    query = db.query(models.Church)
+    query = db.query(models.Church).options(selectinload(models.Church.speakers))
     
     if is_active is not None:
         query = query.filter(models.Church.is_active == is_active)
@@ -30,7 +30,9 @@ def get_churches(
 @router.get("/{church_id}", response_model=ChurchWithSpeakers)
 def get_church(church_id: int, db: Session = Depends(get_db)):
     """Get a specific church by ID with speakers"""
-    church = db.query(models.Church).filter(models.Church.id == church_id).first()
+    church = db.query(models.Church).options(
+        selectinload(models.Church.speakers)
+    ).filter(models.Church.id == church_id).first()
     if not church:
         raise HTTPException(status_code=404, detail="Church not found")
     return church
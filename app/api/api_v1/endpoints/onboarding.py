@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Tuple
+from itertools import chain
+import hashlib
+import orjson
+import time
 from app.db.database import get_db
 from app.db import models
+from app.api.api_v1.endpoints.users import build_user
 from app.models.schemas import (
     OnboardingQuestion, 
     OnboardingSubmit, 
+    OnboardingComplete,
+    OnboardingAnswer,
     OnboardingResponse,
     UserWithPreferences,
     SermonWithSpeakerAndChurch
@@ -13,6 +22,10 @@ from app.models.schemas import (
 
 router = APIRouter()
 
+# Seconds to serve the encoded questions (including speaker options) before re-querying speakers;
+# also sent as max-age so clients can reuse their copy for as long
+QUESTIONS_CACHE_TTL = 300
+
 # Static onboarding questions (matching the Strapi structure)
 ONBOARDING_QUESTIONS = [
     {
@@ -64,11 +77,76 @@ ONBOARDING_QUESTIONS = [
     },
 ]
 
-@router.get("/questions", response_model=List[OnboardingQuestion])
-def get_onboarding_questions(db: Session = Depends(get_db)):
-    """Get onboarding questions with dynamic speaker options"""
+def _encode_question(question: dict) -> bytes:
+    return orjson.dumps(question)
+
+# The static questions never change, so encode them once at import and only
+# build the dynamic speakers question per request
+_SPEAKERS_QUESTION = next(q for q in ONBOARDING_QUESTIONS if q["id"] == "speakers")
+_ENCODED_QUESTIONS = [
+    None if question is _SPEAKERS_QUESTION else _encode_question(question)
+    for question in ONBOARDING_QUESTIONS
+]
+
+# (cached_at, speakers version, encoded questions body, ETag)
+_questions_cache: Optional[Tuple[float, tuple, bytes, str]] = None
+
+def invalidate_questions_cache() -> None:
+    """Drop the cached questions so the next request rebuilds the speaker options."""
+    global _questions_cache
+    _questions_cache = None
+
+# session.info flag set when a flush wrote a Speaker, acted on once the transaction commits
+_SPEAKERS_CHANGED = "onboarding_speakers_changed"
+
+@event.listens_for(Session, "after_flush")
+def _note_speaker_changes(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    if any(isinstance(obj, models.Speaker) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[_SPEAKERS_CHANGED] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Speaker writes change the speaker options; don't wait out the TTL. Invalidating at
+    # commit rather than flush keeps a concurrent request from re-caching uncommitted data
+    if session.info.pop(_SPEAKERS_CHANGED, False):
+        invalidate_questions_cache()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_speaker_changes(session):
+    session.info.pop(_SPEAKERS_CHANGED, None)
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header (a list of strong or weak validators, or *) matches etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+def _speakers_version(db: Session) -> tuple:
+    """Row count and latest write time of speakers, which change with any insert, update or delete.
+    
+    Writes made outside this process (e.g. load_csv_data.py's COPY upsert, which sets updated_at)
+    never reach the session events above, so the cache is also checked against this.
+    """
+    return tuple(db.query(
+        func.count(models.Speaker.id),
+        func.max(func.coalesce(models.Speaker.updated_at, models.Speaker.created_at))
+    ).one())
+
+def _get_encoded_questions(db: Session) -> Tuple[bytes, str]:
+    """Encoded questions body and its ETag, cached until speakers change or QUESTIONS_CACHE_TTL passes."""
+    global _questions_cache
+    now = time.monotonic()
+    version = _speakers_version(db)
+    if _questions_cache is not None:
+        cached_at, cached_version, body, etag = _questions_cache
+        if cached_version == version and now - cached_at < QUESTIONS_CACHE_TTL:
+            return body, etag
+    
     # Get all speakers for the speaker selection question
-    speakers = db.query(models.Speaker).all()
+    speakers = db.query(models.Speaker).options(joinedload(models.Speaker.church)).all()
     
     # Create speaker options
     speaker_options = []
@@ -82,13 +160,23 @@ def get_onboarding_questions(db: Session = Depends(get_db)):
         }
         speaker_options.append(option)
     
-    # Update the speakers question with dynamic options
-    questions = ONBOARDING_QUESTIONS.copy()
-    for question in questions:
-        if question["id"] == "speakers":
-            question["options"] = speaker_options
+    # Splice the speakers question into the pre-encoded static questions
+    encoded_speakers = _encode_question({**_SPEAKERS_QUESTION, "options": speaker_options})
+    body = b"[" + b",".join(encoded_speakers if encoded is None else encoded for encoded in _ENCODED_QUESTIONS) + b"]"
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    _questions_cache = (now, version, body, etag)
+    return body, etag
+
+@router.get("/questions", response_model=List[OnboardingQuestion])
+def get_onboarding_questions(request: Request, db: Session = Depends(get_db)):
+    """Get onboarding questions with dynamic speaker options"""
+    body, etag = _get_encoded_questions(db)
+    headers = {"ETag": etag, "Cache-Control": f"max-age={QUESTIONS_CACHE_TTL}"}
     
-    return questions
+    # Clients revalidating an unchanged copy get an empty 304 instead of the full body
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post("/submit", response_model=OnboardingResponse)
 def submit_onboarding_answers(
@@ -101,8 +189,30 @@ def submit_onboarding_answers(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Update user preferences
-    answers = submission.answers
+    _apply_onboarding_answers(user, submission.answers, db)
+    db.commit()
+    db.refresh(user)
+    
+    return _build_onboarding_response(user, db)
+
+@router.post("/complete", response_model=OnboardingResponse)
+def complete_onboarding(
+    onboarding: OnboardingComplete,
+    db: Session = Depends(get_db)
+):
+    """Create a user, save their onboarding answers and get recommendations in one request"""
+    user = build_user(onboarding.user)
+    db.add(user)
+    db.flush()  # assigns user.id for the speaker preferences
+    
+    _apply_onboarding_answers(user, onboarding.answers, db)
+    db.commit()
+    db.refresh(user)
+    
+    return _build_onboarding_response(user, db)
+
+def _apply_onboarding_answers(user: models.User, answers: OnboardingAnswer, db: Session) -> None:
+    """Copy onboarding answers onto user and replace their speaker preferences; caller commits"""
     user.bible_reading_preference = answers.bible_reading_preference
     user.teaching_style_preference = answers.teaching_style_preference
     user.environment_preference = answers.environment_preference
@@ -125,20 +235,19 @@ def submit_onboarding_answers(
     if answers.speakers:
         # Remove existing preferences
         db.query(models.UserSpeakerPreference).filter(
-            models.UserSpeakerPreference.user_id == submission.user_id
+            models.UserSpeakerPreference.user_id == user.id
         ).delete()
         
         # Add new preferences
         for speaker_id in answers.speakers:
             preference = models.UserSpeakerPreference(
-                user_id=submission.user_id,
+                user_id=user.id,
                 speaker_id=speaker_id
             )
             db.add(preference)
-    
-    db.commit()
-    db.refresh(user)
-    
+
+def _build_onboarding_response(user: models.User, db: Session) -> OnboardingResponse:
+    """Recommend sermons for a freshly onboarded user"""
     # Get recommended speakers based on preferences
     recommended_speakers = get_recommended_speakers(user, db)
     
@@ -147,7 +256,7 @@ def submit_onboarding_answers(
     
     # Get user's preferred speakers
     preferred_speakers = db.query(models.Speaker).join(models.UserSpeakerPreference).filter(
-        models.UserSpeakerPreference.user_id == submission.user_id
+        models.UserSpeakerPreference.user_id == user.id
     ).all()
     
     user_dict = user.__dict__.copy()
@@ -158,15 +267,28 @@ def submit_onboarding_answers(
         recommended_sermons=recommended_sermons
     )
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 @router.get("/recommendations/{user_id}", response_model=List[SermonWithSpeakerAndChurch])
-def get_user_recommendations(user_id: int, db: Session = Depends(get_db)):
-    """Get personalized sermon recommendations for a user"""
+def get_user_recommendations(user_id: int, request: Request, db: Session = Depends(get_db)):
+    """Get personalized sermon recommendations for a user
+    
+    Clients sending `Accept: application/x-ndjson` get one sermon per line, streamed as each
+    is serialized, so they can start parsing before the whole list has arrived.
+    """
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     recommended_speakers = get_recommended_speakers(user, db)
-    return get_recommended_sermons_from_speakers(recommended_speakers, db, limit=5)
+    sermons = get_recommended_sermons_from_speakers(recommended_speakers, db, limit=5)
+    
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        # Speaker and church are eager-loaded above, so serializing after the request's
+        # session has closed never needs a lazy load
+        lines = (SermonWithSpeakerAndChurch.model_validate(sermon).model_dump_json().encode() + b"\n" for sermon in sermons)
+        return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+    return sermons
 
 def get_recommended_speakers(user, db: Session) -> List[models.Speaker]:
     """Get recommended speakers based on user preferences"""
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.db.database import get_db
 from app.db import models
@@ -20,7 +20,7 @@ def get_sermons(
     db: Session = Depends(get_db)
 ):
     """Get all sermons with optional filtering"""
-    query = db.query(models.Sermon)
+    query = db.query(models.Sermon).options(joinedload(models.Sermon.speaker))
     
     if speaker_id:
         query = query.filter(models.Sermon.speaker_id == speaker_id)
@@ -34,7 +34,9 @@ def get_sermons(
 @router.get("/{sermon_id}", response_model=SermonWithSpeaker)
 def get_sermon(sermon_id: int, db: Session = Depends(get_db)):
     """Get a specific sermon by ID with speaker information"""
-    sermon = db.query(models.Sermon).filter(models.Sermon.id == sermon_id).first()
+    sermon = db.query(models.Sermon).options(
+        joinedload(models.Sermon.speaker)
+    ).filter(models.Sermon.id == sermon_id).first()
     if not sermon:
         raise HTTPException(status_code=404, detail="Sermon not found")
     return sermon
@@ -138,7 +140,8 @@ def get_sermon_recommendations(
                     if stored_ai_recs and not ai_service.should_refresh_recommendations(stored_ai_recs, max_age_hours=24):
                         print(f"📂 Using cached AI recommendations for user {user_id}")
                         # Use stored recommendations
-                        ai_speaker_recs = list(zip(stored_ai_recs.speaker_ids, stored_ai_recs.scores or []))
+                        scores = stored_ai_recs.scores.tolist() if stored_ai_recs.scores is not None else []
+                        ai_speaker_recs = list(zip(stored_ai_recs.speaker_ids.tolist(), scores))
                     else:
                         stored_ai_recs = None  # Force regeneration
                 
@@ -151,12 +154,10 @@ def get_sermon_recommendations(
                         models.UserSpeakerPreference.user_id == user_id
                     ).all()
                     
-                    selected_speaker_names = [speaker.name for speaker in selected_speakers]
-                    
                     # Get AI-powered speaker recommendations with learning
                     ai_speaker_recs = ai_service.get_ai_recommendations_with_learning(
                         user, 
-                        selected_speaker_names, 
+                        selected_speakers, 
                         limit=limit*2,  # Get more speakers to have enough sermons
                         force_refresh=refresh,
                         db=db  # Pass database session for learning from ratings
@@ -173,29 +174,8 @@ def get_sermon_recommendations(
                     )
                     
                     if ai_sermon_recs:
-                        # Convert to expected response format
-                        recommendations = []
-                        for rec in ai_sermon_recs:
-                            speaker_info = SpeakerInfo(
-                                id=rec["speaker"]["id"],
-                                name=rec["speaker"]["name"],
-                                title=rec["speaker"]["title"],
-                                teaching_style=rec["speaker"]["teaching_style"],
-                                bible_approach=rec["speaker"]["bible_approach"],
-                                environment_style=rec["speaker"]["environment_style"],
-                                gender=rec["speaker"]["gender"]
-                            )
-                            
-                            sermon_rec = SermonRecommendation(
-                                sermon_id=rec["sermon_id"],
-                                title=rec["title"],
-                                description=rec["description"],
-                                gcs_url=rec["gcs_url"],
-                                speaker=speaker_info,
-                                matching_preferences=[rec["matching_reason"]],
-                                recommendation_score=rec["recommendation_score"]
-                            )
-                            recommendations.append(sermon_rec)
+                        # Already in response format
+                        recommendations = ai_sermon_recs
                         
                         # Get user preferences for context
                         user_preferences = {
@@ -218,7 +198,7 @@ def get_sermon_recommendations(
     ml_service = get_ml_service()
     
     # Get stored recommendations or generate new ones
-    stored_recs = ml_service.get_stored_recommendations(db, user_id)
+    stored_recs = ml_service.get_stored_recommendations(db, user_id, limit=limit*2)
     
     if not stored_recs or refresh:
         # Generate new recommendations using ML model
@@ -237,7 +217,7 @@ def get_sermon_recommendations(
         stored_recs = ml_service.store_recommendations(db, user_id, speaker_recs)
     
     # Get sermons from recommended speakers
-    recommended_speaker_ids = stored_recs.speaker_ids[:limit*2] if stored_recs.speaker_ids else []
+    recommended_speaker_ids = stored_recs.speaker_ids[:limit*2].tolist()
     
     if recommended_speaker_ids:
         # Get sermon clips from recommended speakers, ordered by recommendation score
@@ -247,9 +227,9 @@ def get_sermon_recommendations(
         )
         
         # Order by speaker recommendation score (if available)
-        if stored_recs.scores:
+        if stored_recs.scores is not None and stored_recs.scores.size:
             # Create a mapping of speaker_id to score for ordering
-            speaker_score_map = dict(zip(stored_recs.speaker_ids, stored_recs.scores))
+            speaker_score_map = dict(zip(stored_recs.speaker_ids.tolist(), stored_recs.scores.tolist()))
             sermons = sermons_query.all()
             # Sort sermons by their speaker's recommendation score
             sermons.sort(key=lambda s: speaker_score_map.get(s.speaker_id, 0), reverse=True)
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.db.database import get_db
@@ -7,6 +8,13 @@ from app.models.schemas import Speaker, SpeakerCreate, SpeakerUpdate, SpeakerWit
 
 router = APIRouter()
 
+_speaker_list_adapter = TypeAdapter(List[Speaker])
+
+def _speaker_list_response(speakers: List[models.Speaker]) -> Response:
+    """Serialize speakers to JSON bytes in one pass, bypassing FastAPI's jsonable_encoder"""
+    validated = _speaker_list_adapter.validate_python(speakers, from_attributes=True)
+    return Response(content=_speaker_list_adapter.dump_json(validated), media_type="application/json")
+
 @router.get("/", response_model=List[Speaker])
 def get_speakers(
     skip: int = Query(0, ge=0),
@@ -37,12 +45,14 @@ def get_speakers(
         query = query.filter(models.Speaker.environment_style == environment_style)
     
     speakers = query.offset(skip).limit(limit).all()
-    return speakers
+    return _speaker_list_response(speakers)
 
 @router.get("/{speaker_id}", response_model=SpeakerWithChurch)
 def get_speaker(speaker_id: int, db: Session = Depends(get_db)):
     """Get a specific speaker by ID with church information"""
-    speaker = db.query(models.Speaker).filter(models.Speaker.id == speaker_id).first()
+    speaker = db.query(models.Speaker).options(
+        joinedload(models.Speaker.church)
+    ).filter(models.Speaker.id == speaker_id).first()
     if not speaker:
         raise HTTPException(status_code=404, detail="Speaker not found")
     return speaker
@@ -90,7 +100,7 @@ def delete_speaker(speaker_id: int, db: Session = Depends(get_db)):
 def get_church_speakers(church_id: int, db: Session = Depends(get_db)):
     """Get all speakers for a specific church"""
     speakers = db.query(models.Speaker).filter(models.Speaker.church_id == church_id).all()
-    return speakers
+    return _speaker_list_response(speakers)
 
 @router.get("/{speaker_id}/churches", response_model=List[Church])
 def get_speaker_churches(speaker_id: int, db: Session = Depends(get_db)):
@@ -40,13 +40,12 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
     
     return user_dict
 
-@router.post("/", response_model=User)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    """Create a new user"""
+def build_user(user: UserCreate) -> models.User:
+    """Build an unsaved User row from a create request"""
     # In a real app, you'd hash the password here
     hashed_password = user.password  # This should be hashed!
     
-    db_user = models.User(
+    return models.User(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password,
@@ -57,6 +56,11 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         teaching_style_preference=user.teaching_style_preference,
         environment_preference=user.environment_preference
     )
+
+@router.post("/", response_model=User)
+def create_user(user: UserCreate, db: Session = Depends(get_db)):
+    """Create a new user"""
+    db_user = build_user(user)
     
     db.add(db_user)
     db.commit()
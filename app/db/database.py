@@ -3,7 +3,18 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+# values_plus_batch: psycopg2 sends executemany UPDATEs (e.g. bulk updates by primary key)
+# in execute_batch pages instead of one round-trip per row; INSERTs already use multi-row VALUES
+# pool_pre_ping/pool_recycle replace connections the server dropped while idle instead of
+# hanging on them, e.g. between loader re-runs
+engine = create_engine(
+    settings.DATABASE_URL,
+    executemany_mode="values_plus_batch",
+    pool_size=8,
+    max_overflow=4,
+    pool_pre_ping=True,
+    pool_recycle=1800
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -1,9 +1,34 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Table, UniqueConstraint, ARRAY
+import numpy as np
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Table, UniqueConstraint, ARRAY, LargeBinary, event, exists, false, inspect, update
 from sqlalchemy.orm import relationship
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.sql import func
 from app.db.database import Base
 from app.models.schemas import TeachingStyle, BibleApproach, EnvironmentStyle, TopicCategory, Gender
 
+class PackedArray(TypeDecorator):
+    """Fixed-dtype 1-D array stored as raw little-endian bytes (bytea).
+    
+    Accepts any sequence on write; reads back as a read-only np.ndarray via
+    np.frombuffer, with no per-element Python conversion either way.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def __init__(self, dtype, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dtype = np.dtype(dtype).newbyteorder('<')
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return np.asarray(value, dtype=self.dtype).tobytes()
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=self.dtype)
+
 # Association table for many-to-many relationship between speakers and churches
 speaker_church_association = Table(
     'speaker_church_associations',
@@ -32,6 +57,7 @@ class Church(Base):
     attributes = Column(ARRAY(String))  # Array of free form strings
     is_active = Column(Boolean, default=True)
     sort_order = Column(Integer, default=0)
+    content_hash = Column(String(32))  # Hash of the CSV row last loaded by load_csv_data.py
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -63,6 +89,8 @@ class Speaker(Base):
     profile_picture_url = Column(String(500))  # URL to profile picture in GCS
     attributes = Column(ARRAY(String))  # Array of free form strings
     is_recommended = Column(Boolean, default=False)
+    has_sermons = Column(Boolean, nullable=False, default=False, server_default=false(), index=True)  # Denormalized, kept in sync by Sermon events below
+    content_hash = Column(String(32))  # Hash of the CSV row last loaded by load_csv_data.py
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -98,6 +126,35 @@ class Sermon(Base):
     def __str__(self):
         return self.title
 
+def _sync_speaker_has_sermons(connection, speaker_id):
+    """Recompute speakers.has_sermons for one speaker inside the current flush"""
+    if speaker_id is None:
+        return
+    connection.execute(
+        update(Speaker.__table__)
+        .where(Speaker.__table__.c.id == speaker_id)
+        .values(has_sermons=exists().where(Sermon.__table__.c.speaker_id == speaker_id))
+    )
+
+@event.listens_for(Sermon, "after_insert")
+def _sermon_after_insert(mapper, connection, target):
+    connection.execute(
+        update(Speaker.__table__)
+        .where(Speaker.__table__.c.id == target.speaker_id, Speaker.__table__.c.has_sermons.is_(False))
+        .values(has_sermons=True)
+    )
+
+@event.listens_for(Sermon, "after_delete")
+def _sermon_after_delete(mapper, connection, target):
+    _sync_speaker_has_sermons(connection, target.speaker_id)
+
+@event.listens_for(Sermon, "after_update")
+def _sermon_after_update(mapper, connection, target):
+    history = inspect(target).attrs.speaker_id.history
+    if history.has_changes():
+        for speaker_id in (*history.deleted, *history.added):
+            _sync_speaker_has_sermons(connection, speaker_id)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -172,8 +229,8 @@ class Recommendations(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    speaker_ids = Column(JSON, nullable=False)  # Array of speaker IDs as JSON
-    scores = Column(JSON, nullable=True)  # Optional: Array of recommendation scores as JSON
+    speaker_ids = Column(PackedArray(np.int32), nullable=False)  # Packed int32 speaker IDs, best first
+    scores = Column(PackedArray(np.float32), nullable=True)  # Optional: packed float32 scores aligned with speaker_ids
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
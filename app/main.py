@@ -1,20 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.api_v1.api import api_router
 from app.db.database import engine
 from app.db import models
 from app.admin import admin_app
+from app.services.ai_embedding_service import configure_torch_threads
 
 # Note: Database tables are now managed by Alembic migrations
 # Run 'alembic upgrade head' to apply migrations
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process-wide torch thread settings are applied once here, not by any one service
+    configure_torch_threads()
+    yield
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="PewPal API",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    redirect_slashes=True
+    redirect_slashes=True,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Set up CORS
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator, model_validator
 from typing import Optional, List, Dict, Any, Union
 from enum import Enum
 from datetime import datetime
@@ -122,15 +122,13 @@ class ChurchUpdate(BaseModel):
     sort_order: Optional[int] = None
 
 class Church(ChurchBase):
+    # Read model: emails come from the DB, so skip EmailStr re-validation
+    email: Optional[str] = None
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
-
-class ChurchWithSpeakers(Church):
-    speakers: List["Speaker"] = []
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 # Speaker schemas
 class SpeakerBase(BaseModel):
@@ -205,16 +203,21 @@ class SpeakerUpdate(BaseModel):
     church_id: Optional[int] = None
 
 class Speaker(SpeakerBase):
+    # Read model: emails come from the DB, so skip EmailStr re-validation
+    email: Optional[str] = None
     id: int
     church_id: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    model_config = {"from_attributes": True}
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class SpeakerWithChurch(Speaker):
     church: Optional[Church] = None
 
+class ChurchWithSpeakers(Church):
+    speakers: List[Speaker] = []
+
 # Sermon schemas
 class SermonBase(BaseModel):
     title: str
@@ -238,8 +241,7 @@ class Sermon(SermonBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class SermonWithSpeaker(Sermon):
     speaker: Optional[Speaker] = None
@@ -272,13 +274,14 @@ class UserUpdate(BaseModel):
     gender_preference: Optional[Gender] = None
 
 class User(UserBase):
+    # Read model: emails come from the DB, so skip EmailStr re-validation
+    email: str
     id: int
     is_active: bool = True
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class UserWithPreferences(User):
     preferred_speakers: List[Speaker] = []
@@ -302,6 +305,10 @@ class OnboardingSubmit(BaseModel):
     user_id: int
     answers: OnboardingAnswer
 
+class OnboardingComplete(BaseModel):
+    user: UserCreate
+    answers: OnboardingAnswer
+
 class OnboardingResponse(BaseModel):
     user: UserWithPreferences
     recommended_sermons: List[SermonWithSpeakerAndChurch]
@@ -318,8 +325,7 @@ class ChurchFollowers(ChurchFollowersBase):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 
 class ChurchFollowersWithDetails(ChurchFollowers):
@@ -376,8 +382,7 @@ class SpeakerFollowers(SpeakerFollowersBase):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class SpeakerFollowersWithDetails(SpeakerFollowers):
     speaker: Optional[Speaker] = None
@@ -392,6 +397,8 @@ class SpeakerInfo(BaseModel):
     bible_approach: Optional[BibleApproach] = None
     environment_style: Optional[EnvironmentStyle] = None
     gender: Optional[Gender] = None
+    
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
 
 class SermonRecommendation(BaseModel):
     sermon_id: int
@@ -401,6 +408,8 @@ class SermonRecommendation(BaseModel):
     speaker: SpeakerInfo
     matching_preferences: List[str] = []
     recommendation_score: float
+    
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
 
 class SermonRecommendationsResponse(BaseModel):
     recommendations: List[SermonRecommendation]
@@ -428,8 +437,7 @@ class SermonPreference(SermonPreferenceBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class SermonPreferenceWithDetails(SermonPreference):
     sermon: Optional[Sermon] = None
@@ -457,8 +465,7 @@ class Recommendations(RecommendationsBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class RecommendationsWithDetails(Recommendations):
     user: Optional[User] = None
@@ -478,6 +485,8 @@ class ChurchRecommendation(BaseModel):
     description: Optional[str] = None
     recommended_speakers: List[SpeakerInfo] = []
     recommendation_score: Optional[float] = None
+    
+    model_config = ConfigDict(frozen=True, validate_assignment=False)
 
 class ChurchRecommendationsResponse(BaseModel):
     recommendations: List[ChurchRecommendation]
@@ -503,18 +512,8 @@ class FeaturedSermon(FeaturedSermonBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, validate_assignment=False)
 
 class FeaturedSermonWithDetails(FeaturedSermon):
     church: Optional[Church] = None
     sermon: Optional[SermonWithSpeaker] = None
-
-# Update forward references
-ChurchWithSpeakers.model_rebuild()
-SpeakerWithChurch.model_rebuild()
-SermonWithSpeaker.model_rebuild()
-UserWithPreferences.model_rebuild()
-ChurchFollowersWithDetails.model_rebuild()
-SpeakerFollowersWithDetails.model_rebuild()
-RecommendationsWithDetails.model_rebuild()
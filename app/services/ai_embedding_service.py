@@ -6,23 +6,185 @@ and user preferences, enabling AI-powered recommendations based on meaning rathe
 than just categorical matching.
 """
 
-import json
+import os
 import pickle
+import logging
+import hashlib
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 import numpy as np
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
-from sqlalchemy.orm import Session
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import Callable, List, Dict, Tuple, Optional
+from sqlalchemy import event, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+logger = logging.getLogger(__name__)
 
 try:
+    import torch
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
-    print("⚠️ sentence-transformers not installed. Install with: pip install sentence-transformers")
+    logger.warning("sentence-transformers not installed. Install with: pip install sentence-transformers")
 
 from app.db import models
-from app.models.schemas import TeachingStyle, BibleApproach, EnvironmentStyle, Gender
+from app.models.schemas import TeachingStyle, BibleApproach, EnvironmentStyle, Gender, SermonRecommendation, SpeakerInfo
+
+# Max number of user preference texts whose embeddings are kept in memory
+USER_EMBEDDING_CACHE_SIZE = 1024
+
+# Intra-op threads for CPU inference; more than ~8 mostly adds contention between uvicorn workers
+SBERT_THREADS = int(os.getenv("SBERT_THREADS", "4"))
+
+# Above this many speakers, embedding generation fans out to a multi-process pool
+MULTI_PROCESS_ENCODE_THRESHOLD = 500
+MULTI_PROCESS_ENCODE_WORKERS = 4
+
+# How long the "speaker has sermons" mask is reused before re-querying
+SERMON_MASK_TTL_SECONDS = 300
+
+# Worker threads used to build speaker texts before batch encoding
+TEXT_PREP_WORKERS = 4
+
+# Texts per forward pass when encoding all speakers; large batches keep the GPU (fp16) or CPU busy
+ENCODE_BATCH_SIZE = 128
+
+# int8 ONNX export produced by export_onnx_model.py, relative to ai_cache/onnx
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Enum -> descriptive text used when building speaker and user texts
+_TEACHING_STYLE_TEXT = {
+    TeachingStyle.WARM_AND_CONVERSATIONAL: "warm, conversational, and relatable",
+    TeachingStyle.PASSIONATE_AND_HIGH_ENERGY: "passionate, energetic, and dynamic",
+    TeachingStyle.CALM_AND_REFLECTIVE: "calm, thoughtful, and reflective"
+}
+
+_BIBLE_APPROACH_TEXT = {
+    BibleApproach.MORE_SCRIPTURE: "deep biblical study and scriptural analysis",
+    BibleApproach.MORE_APPLICATION: "practical life application and real-world examples",
+    BibleApproach.BALANCED: "balanced approach combining scripture study and practical application"
+}
+
+_ENV_STYLE_TEXT = {
+    EnvironmentStyle.TRADITIONAL: "traditional worship with hymns and formal liturgy",
+    EnvironmentStyle.CONTEMPORARY: "contemporary worship with modern music and casual atmosphere",
+    EnvironmentStyle.BLENDED: "blended worship combining traditional and contemporary elements"
+}
+
+_GENDER_TEXT = {
+    Gender.MALE: "male",
+    Gender.FEMALE: "female"
+}
+
+_TEACHING_PREF_TEXT = {
+    TeachingStyle.WARM_AND_CONVERSATIONAL: "warm, conversational, and relatable teaching",
+    TeachingStyle.PASSIONATE_AND_HIGH_ENERGY: "passionate, energetic, and dynamic presentations",
+    TeachingStyle.CALM_AND_REFLECTIVE: "calm, thoughtful, and reflective communication"
+}
+
+_ENV_PREF_TEXT = {
+    EnvironmentStyle.TRADITIONAL: "traditional worship with hymns and formal services",
+    EnvironmentStyle.CONTEMPORARY: "contemporary worship with modern music and casual atmosphere",
+    EnvironmentStyle.BLENDED: "blended worship combining traditional and contemporary elements"
+}
+
+_GENDER_PREF_TEXT = {
+    Gender.MALE: "male speakers",
+    Gender.FEMALE: "female speakers"
+}
+
+# Speaker description fed to the encoder. Lines are joined with the indentation the
+# original inline f-string produced, so texts (and cached embeddings) are unchanged.
+_SPEAKER_TEMPLATE = "\n        ".join([
+    "{name} is a {title} {location}.",
+    "",
+    "Background: {bio}",
+    "",
+    "Teaching Style: {name} communicates with a {teaching_style} approach, making messages accessible and engaging.",
+    "",
+    "Biblical Approach: They focus on {bible_approach}, helping people understand and apply God's word.",
+    "",
+    "Ministry Environment: {name} ministers in {environment}, creating an atmosphere that connects with their audience.",
+    "",
+    "Speaking Topics: {topics}",
+    "",
+    "Church Context: {church_name} ",
+    "{denomination}",
+    "{description}",
+    "",
+    "Gender: {gender} speaker",
+    "",
+    "Ministry Impact: {impact}",
+    "",
+    "Years of Experience: {experience}"
+])
+
+_IMPACT_RECOMMENDED = "This speaker is highly recommended for their impactful ministry and transformative teaching"
+_IMPACT_DEFAULT = "Known for authentic, biblical teaching that connects with diverse audiences"
+
+# Single-word reason pills for a matched preference
+_TEACHING_STYLE_REASON = {
+    TeachingStyle.WARM_AND_CONVERSATIONAL: "Conversational",
+    TeachingStyle.PASSIONATE_AND_HIGH_ENERGY: "Energetic",
+    TeachingStyle.CALM_AND_REFLECTIVE: "Reflective"
+}
+
+_BIBLE_APPROACH_REASON = {
+    BibleApproach.MORE_SCRIPTURE: "Scripture-focused",
+    BibleApproach.MORE_APPLICATION: "Practical",
+    BibleApproach.BALANCED: "Balanced"
+}
+
+_ENV_STYLE_REASON = {
+    EnvironmentStyle.TRADITIONAL: "Traditional",
+    EnvironmentStyle.CONTEMPORARY: "Contemporary",
+    EnvironmentStyle.BLENDED: "Blended"
+}
+
+# Small integer codes for speaker attributes, used by the vectorized church scoring (-1 = unset)
+_TEACHING_STYLE_CODES = {member: code for code, member in enumerate(TeachingStyle)}
+_BIBLE_APPROACH_CODES = {member: code for code, member in enumerate(BibleApproach)}
+_ENV_STYLE_CODES = {member: code for code, member in enumerate(EnvironmentStyle)}
+
+# Denominations mapped to the worship environment they most likely offer
+_DENOM_ENV_MAP = {
+    'Presbyterian': EnvironmentStyle.TRADITIONAL,
+    'Catholic': EnvironmentStyle.TRADITIONAL,
+    'Lutheran': EnvironmentStyle.TRADITIONAL,
+    'Methodist': EnvironmentStyle.BLENDED,
+    'Baptist': EnvironmentStyle.TRADITIONAL,
+    'Non-denominational': EnvironmentStyle.CONTEMPORARY,
+    'Assembly of God': EnvironmentStyle.CONTEMPORARY,
+    'Pentecostal': EnvironmentStyle.CONTEMPORARY
+}
+
+
+_torch_threads_configured = False
+
+
+def configure_torch_threads():
+    """Size torch's CPU thread pools for inference; call once at app startup
+    
+    These are process-wide settings, so they belong to the app entry point rather than
+    to a service. Later calls are no-ops.
+    """
+    global _torch_threads_configured
+    if _torch_threads_configured or not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return
+    _torch_threads_configured = True
+    torch.set_num_threads(SBERT_THREADS)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError as e:
+        # Can only be set once per process, before any inter-op parallel work has started
+        logger.warning("Could not set torch inter-op threads: %s", e)
 
 
 class AIEmbeddingService:
@@ -36,90 +198,99 @@ class AIEmbeddingService:
         """
         self.model = None
         self.model_name = model_name
-        self.speaker_embeddings = {}
+        self.device = 'cpu'
+        self._speaker_ids = np.empty(0, dtype=np.int64)
+        self._speaker_matrix = np.empty((0, 0), dtype=np.float32)
+        self._has_sermon_mask: Optional[np.ndarray] = None
+        self._has_sermon_mask_at = 0.0
+        self._user_embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._user_embedding_lock = threading.Lock()
         self.cache_dir = Path(__file__).parent.parent.parent / "ai_cache"
         self.cache_dir.mkdir(exist_ok=True)
         
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.model = SentenceTransformer(model_name)
-                print(f"✅ AI model '{model_name}' loaded successfully")
+                self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+                onnx_dir = self.cache_dir / "onnx"
+                if self.device == 'cpu' and (onnx_dir / ONNX_MODEL_FILE).exists():
+                    # Quantized ONNX export is several times faster on CPU than the torch model
+                    self.model = SentenceTransformer(
+                        str(onnx_dir), backend='onnx', model_kwargs={'file_name': ONNX_MODEL_FILE}
+                    )
+                    backend = 'onnx'
+                else:
+                    self.model = SentenceTransformer(model_name, device=self.device)
+                    if self.device == 'cuda':
+                        self.model.half()
+                    backend = 'torch'
+                self.model.eval()
+                logger.info("AI model '%s' loaded successfully on %s (%s)", model_name, self.device, backend)
             except Exception as e:
-                print(f"⚠️ Failed to load AI model: {e}")
+                logger.warning("Failed to load AI model: %s", e)
                 self.model = None
         else:
-            print("⚠️ Sentence transformers not available, using fallback recommendations")
+            logger.warning("Sentence transformers not available, using fallback recommendations")
     
     def is_available(self) -> bool:
         """Check if AI service is available"""
         return self.model is not None
     
+    def has_embeddings(self) -> bool:
+        """Check if speaker embeddings are loaded in memory"""
+        return self._speaker_ids.size > 0
+    
+    @property
+    def speaker_embeddings(self) -> Dict[int, np.ndarray]:
+        """Speaker id -> embedding view over the cached matrix"""
+        return {int(speaker_id): row for speaker_id, row in zip(self._speaker_ids, self._speaker_matrix)}
+    
     def prepare_speaker_text(self, speaker: models.Speaker) -> str:
         """Convert speaker data into descriptive text for AI processing"""
         
         # Handle speaking topics
         topics_text = ""
-        if hasattr(speaker, 'speaking_topics') and speaker.speaking_topics:
+        topics_data = getattr(speaker, 'speaking_topics', None)
+        if topics_data:
             try:
-                if isinstance(speaker.speaking_topics, str):
-                    topics_data = json.loads(speaker.speaking_topics)
-                    if isinstance(topics_data, list):
-                        topics_text = ', '.join([topic.get('name', '') for topic in topics_data if isinstance(topic, dict)])
-                elif isinstance(speaker.speaking_topics, list):
-                    topics_text = ', '.join([topic.get('name', '') for topic in speaker.speaking_topics if isinstance(topic, dict)])
-            except (json.JSONDecodeError, AttributeError):
+                if isinstance(topics_data, (str, bytes)):
+                    topics_data = orjson.loads(topics_data)
+                if isinstance(topics_data, list):
+                    topics_text = ', '.join(topic.get('name', '') for topic in topics_data if isinstance(topic, dict))
+            except orjson.JSONDecodeError:
                 topics_text = ""
         
         # Convert enums to readable text
-        teaching_style_text = self._enum_to_text(speaker.teaching_style, {
-            TeachingStyle.WARM_AND_CONVERSATIONAL: "warm, conversational, and relatable",
-            TeachingStyle.PASSIONATE_AND_HIGH_ENERGY: "passionate, energetic, and dynamic",
-            TeachingStyle.CALM_AND_REFLECTIVE: "calm, thoughtful, and reflective"
-        })
-        
-        bible_approach_text = self._enum_to_text(speaker.bible_approach, {
-            BibleApproach.MORE_SCRIPTURE: "deep biblical study and scriptural analysis",
-            BibleApproach.MORE_APPLICATION: "practical life application and real-world examples",
-            BibleApproach.BALANCED: "balanced approach combining scripture study and practical application"
-        })
-        
-        environment_text = self._enum_to_text(speaker.environment_style, {
-            EnvironmentStyle.TRADITIONAL: "traditional worship with hymns and formal liturgy",
-            EnvironmentStyle.CONTEMPORARY: "contemporary worship with modern music and casual atmosphere",
-            EnvironmentStyle.BLENDED: "blended worship combining traditional and contemporary elements"
-        })
-        
-        gender_text = self._enum_to_text(speaker.gender, {
-            Gender.MALE: "male",
-            Gender.FEMALE: "female"
-        })
+        teaching_style_text = self._enum_to_text(speaker.teaching_style, _TEACHING_STYLE_TEXT)
+        bible_approach_text = self._enum_to_text(speaker.bible_approach, _BIBLE_APPROACH_TEXT)
+        environment_text = self._enum_to_text(speaker.environment_style, _ENV_STYLE_TEXT)
+        gender_text = self._enum_to_text(speaker.gender, _GENDER_TEXT)
         
         # Build comprehensive speaker description with enhanced context
-        speaker_text = f"""
-        {speaker.name} is a {speaker.title or 'speaker'} {f"at {speaker.church.name}" if speaker.church else "in independent ministry"}.
-        
-        Background: {speaker.bio or 'Experienced speaker and teacher with a heart for ministry and spiritual growth'}
-        
-        Teaching Style: {speaker.name} communicates with a {teaching_style_text} approach, making messages accessible and engaging.
-        
-        Biblical Approach: They focus on {bible_approach_text}, helping people understand and apply God's word.
-        
-        Ministry Environment: {speaker.name} ministers in {environment_text}, creating an atmosphere that connects with their audience.
-        
-        Speaking Topics: {topics_text or 'Faith, spiritual growth, Christian living, biblical wisdom, and practical discipleship'}
-        
-        Church Context: {speaker.church.name if speaker.church else 'Independent ministry'} 
-        {f"({speaker.church.denomination})" if speaker.church and speaker.church.denomination else ""}
-        {f"- {speaker.church.description}" if speaker.church and speaker.church.description else ""}
-        
-        Gender: {gender_text} speaker
-        
-        Ministry Impact: {"This speaker is highly recommended for their impactful ministry and transformative teaching" if speaker.is_recommended else "Known for authentic, biblical teaching that connects with diverse audiences"}
-        
-        Years of Experience: {f"{speaker.years_of_service} years in ministry" if speaker.years_of_service else "Experienced in pastoral ministry and teaching"}
-        """.strip()
-        
-        return speaker_text
+        church = speaker.church
+        return _SPEAKER_TEMPLATE.format(
+            name=speaker.name,
+            title=speaker.title or 'speaker',
+            location=f"at {church.name}" if church else "in independent ministry",
+            bio=speaker.bio or 'Experienced speaker and teacher with a heart for ministry and spiritual growth',
+            teaching_style=teaching_style_text,
+            bible_approach=bible_approach_text,
+            environment=environment_text,
+            topics=topics_text or 'Faith, spiritual growth, Christian living, biblical wisdom, and practical discipleship',
+            church_name=church.name if church else 'Independent ministry',
+            denomination=f"({church.denomination})" if church and church.denomination else "",
+            description=f"- {church.description}" if church and church.description else "",
+            gender=gender_text,
+            impact=_IMPACT_RECOMMENDED if speaker.is_recommended else _IMPACT_DEFAULT,
+            experience=f"{speaker.years_of_service} years in ministry" if speaker.years_of_service else "Experienced in pastoral ministry and teaching"
+        )
+    
+    def _prepare_speaker_text_safe(self, speaker: models.Speaker) -> Optional[str]:
+        """prepare_speaker_text that logs and returns None instead of raising"""
+        try:
+            return self.prepare_speaker_text(speaker)
+        except Exception as e:
+            logger.warning("Failed to prepare text for %s: %s", speaker.name, e)
+            return None
     
     def _enum_to_text(self, enum_value, mapping: Dict) -> str:
         """Convert enum to human-readable text"""
@@ -131,28 +302,10 @@ class AIEmbeddingService:
         """Convert user preferences into descriptive text for AI processing"""
         
         # Convert preferences to readable text
-        bible_pref_text = self._enum_to_text(user.bible_reading_preference, {
-            BibleApproach.MORE_SCRIPTURE: "deep biblical study and scriptural analysis",
-            BibleApproach.MORE_APPLICATION: "practical life application and real-world examples", 
-            BibleApproach.BALANCED: "balanced approach combining scripture study and practical application"
-        })
-        
-        teaching_pref_text = self._enum_to_text(user.teaching_style_preference, {
-            TeachingStyle.WARM_AND_CONVERSATIONAL: "warm, conversational, and relatable teaching",
-            TeachingStyle.PASSIONATE_AND_HIGH_ENERGY: "passionate, energetic, and dynamic presentations",
-            TeachingStyle.CALM_AND_REFLECTIVE: "calm, thoughtful, and reflective communication"
-        })
-        
-        environment_pref_text = self._enum_to_text(user.environment_preference, {
-            EnvironmentStyle.TRADITIONAL: "traditional worship with hymns and formal services",
-            EnvironmentStyle.CONTEMPORARY: "contemporary worship with modern music and casual atmosphere",
-            EnvironmentStyle.BLENDED: "blended worship combining traditional and contemporary elements"
-        })
-        
-        gender_pref_text = self._enum_to_text(user.gender_preference, {
-            Gender.MALE: "male speakers",
-            Gender.FEMALE: "female speakers"
-        })
+        bible_pref_text = self._enum_to_text(user.bible_reading_preference, _BIBLE_APPROACH_TEXT)
+        teaching_pref_text = self._enum_to_text(user.teaching_style_preference, _TEACHING_PREF_TEXT)
+        environment_pref_text = self._enum_to_text(user.environment_preference, _ENV_PREF_TEXT)
+        gender_pref_text = self._enum_to_text(user.gender_preference, _GENDER_PREF_TEXT)
         
         # Build user preference description
         user_text = f"""
@@ -173,54 +326,196 @@ class AIEmbeddingService:
         
         return user_text
     
-    def generate_speaker_embeddings(self, db: Session) -> Dict[int, np.ndarray]:
-        """Generate AI embeddings for all speakers"""
+    def _encode_user_text(self, text: str) -> np.ndarray:
+        """Encode user preference text, reusing the embedding when the same text was seen recently"""
+        key = hashlib.blake2b(b"text:" + text.encode("utf-8"), digest_size=16).digest()
+        return self._cached_user_embedding(key, lambda: text)
+    
+    def _encode_user_preferences(self, user: models.User, selected_speakers: List[str] = None) -> np.ndarray:
+        """Encode a user's preference text, skipping even the text build when the
+        same preferences were encoded recently"""
+        preferences = "|".join([
+            str(user.bible_reading_preference),
+            str(user.teaching_style_preference),
+            str(user.environment_preference),
+            str(user.gender_preference),
+            ",".join(selected_speakers or [])
+        ])
+        key = hashlib.blake2b(b"pref:" + preferences.encode("utf-8"), digest_size=16).digest()
+        return self._cached_user_embedding(
+            key, lambda: self.prepare_user_preference_text(user, selected_speakers)
+        )
+    
+    def _cached_user_embedding(self, key: bytes, build_text: Callable[[], str]) -> np.ndarray:
+        """Look key up in the user embedding LRU, encoding build_text() on a miss"""
+        with self._user_embedding_lock:
+            cached = self._user_embedding_cache.get(key)
+            if cached is not None:
+                self._user_embedding_cache.move_to_end(key)
+                return cached
+        
+        text = build_text()
+        with torch.inference_mode():
+            embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        with self._user_embedding_lock:
+            self._user_embedding_cache[key] = embedding
+            if len(self._user_embedding_cache) > USER_EMBEDDING_CACHE_SIZE:
+                self._user_embedding_cache.popitem(last=False)
+        return embedding
+    
+    def generate_speaker_embeddings(self, db: Session, batch_size: int = ENCODE_BATCH_SIZE) -> Dict[int, np.ndarray]:
+        """Generate AI embeddings for all speakers
+        
+        Args:
+            db: Database session
+            batch_size: Texts per forward pass during encoding
+        """
         if not self.is_available():
             return {}
         
-        print("🤖 Generating AI embeddings for speakers...")
+        logger.info("Generating AI embeddings for speakers")
         
-        # Get all speakers with their relationships loaded
-        speakers = db.query(models.Speaker).all()
-        embeddings = {}
-        
-        for speaker in speakers:
+        # Get all speakers with their relationships loaded, so no lazy load
+        # (and no Session access) happens inside the worker threads below
+        speakers = db.query(models.Speaker).options(selectinload(models.Speaker.church)).all()
+
+        with ThreadPoolExecutor(max_workers=TEXT_PREP_WORKERS) as executor:
+            prepared = list(executor.map(self._prepare_speaker_text_safe, speakers))
+
+        speaker_ids = []
+        texts = []
+        for speaker, text in zip(speakers, prepared):
+            if text is not None:
+                speaker_ids.append(speaker.id)
+                texts.append(text)
+
+        # Encode everything in one call so sentence-transformers can sort by
+        # length and batch with minimal padding
+        if self.device == 'cpu' and len(texts) > MULTI_PROCESS_ENCODE_THRESHOLD:
+            pool = self.model.start_multi_process_pool(['cpu'] * MULTI_PROCESS_ENCODE_WORKERS)
             try:
-                speaker_text = self.prepare_speaker_text(speaker)
-                embedding = self.model.encode(speaker_text)
-                embeddings[speaker.id] = embedding
-                print(f"✅ Generated embedding for {speaker.name}")
-            except Exception as e:
-                print(f"⚠️ Failed to generate embedding for {speaker.name}: {e}")
-        
+                vectors = self.model.encode_multi_process(
+                    texts, pool, batch_size=batch_size, normalize_embeddings=True
+                )
+            finally:
+                self.model.stop_multi_process_pool(pool)
+        elif texts:
+            with torch.inference_mode():
+                vectors = self.model.encode(
+                    texts,
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=True
+                )
+        else:
+            vectors = []
+        embeddings = dict(zip(speaker_ids, vectors))
+
         # Cache the embeddings
-        self.speaker_embeddings = embeddings
+        self._rebuild_speaker_matrix(embeddings)
         self._save_embeddings_to_cache()
         
-        print(f"🎯 Generated {len(embeddings)} speaker embeddings")
+        logger.info("Generated %d speaker embeddings", len(embeddings))
         return embeddings
     
+    def _rebuild_speaker_matrix(self, embeddings: Dict[int, np.ndarray]):
+        """Stack unit-length speaker embeddings into an (N, D) matrix aligned with _speaker_ids"""
+        self._has_sermon_mask = None
+        if not embeddings:
+            self._speaker_ids = np.empty(0, dtype=np.int64)
+            self._speaker_matrix = np.empty((0, 0), dtype=np.float32)
+            return
+        
+        self._speaker_ids = np.fromiter(embeddings.keys(), dtype=np.int64)
+        matrix = np.stack(list(embeddings.values())).astype(np.float32)
+        self._speaker_matrix = matrix
+    
+    def _score_speakers(
+        self,
+        user_embedding: np.ndarray,
+        has_sermon_mask: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine similarity of a user embedding against every cached speaker in one matmul
+        
+        Both sides are unit length, so cosine similarity is a plain dot product.
+        
+        Returns:
+            (speaker_ids, similarities) arrays, restricted by has_sermon_mask when it selects any speaker
+        """
+        similarities = self._speaker_matrix @ np.asarray(user_embedding, dtype=np.float32)
+        
+        speaker_ids = self._speaker_ids
+        if has_sermon_mask is not None and has_sermon_mask.any():
+            speaker_ids, similarities = speaker_ids[has_sermon_mask], similarities[has_sermon_mask]
+        return speaker_ids, similarities
+    
+    def invalidate_has_sermon_mask(self):
+        """Drop the cached has-sermon mask so the next request rebuilds it"""
+        self._has_sermon_mask = None
+    
+    def _get_has_sermon_mask(self, db: Session) -> np.ndarray:
+        """Boolean mask over _speaker_ids marking speakers with at least one sermon
+        
+        Cached for SERMON_MASK_TTL_SECONDS and reset whenever the speaker matrix changes.
+        """
+        now = time.monotonic()
+        if self._has_sermon_mask is None or now - self._has_sermon_mask_at > SERMON_MASK_TTL_SECONDS:
+            speaker_ids = [
+                speaker_id for (speaker_id,) in
+                db.query(models.Speaker.id).filter(models.Speaker.has_sermons.is_(True))
+            ]
+            logger.debug("Found %d speakers with sermons", len(speaker_ids))
+            self._has_sermon_mask = np.isin(self._speaker_ids, speaker_ids)
+            self._has_sermon_mask_at = now
+        return self._has_sermon_mask
+    
+    @staticmethod
+    def _top_k(speaker_ids: np.ndarray, scores: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+        """Pick the highest `limit` scores in O(N) and sort only those"""
+        k = min(limit, scores.size)
+        if k <= 0:
+            return []
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+        return [(int(speaker_ids[i]), float(scores[i])) for i in top_idx]
+    
     def _save_embeddings_to_cache(self):
-        """Save embeddings to cache file"""
+        """Save the speaker matrix and its aligned ids as .npy files"""
         try:
-            cache_file = self.cache_dir / "speaker_embeddings.pkl"
-            with open(cache_file, 'wb') as f:
-                pickle.dump(self.speaker_embeddings, f)
-            print(f"💾 Cached embeddings to {cache_file}")
+            np.save(self.cache_dir / "speaker_matrix.npy", np.ascontiguousarray(self._speaker_matrix))
+            np.save(self.cache_dir / "speaker_ids.npy", self._speaker_ids)
+            logger.info("Cached embeddings to %s", self.cache_dir)
         except Exception as e:
-            print(f"⚠️ Failed to cache embeddings: {e}")
+            logger.warning("Failed to cache embeddings: %s", e)
     
     def _load_embeddings_from_cache(self) -> bool:
-        """Load embeddings from cache file"""
+        """Load embeddings from cache, memory-mapping the speaker matrix"""
         try:
-            cache_file = self.cache_dir / "speaker_embeddings.pkl"
-            if cache_file.exists():
-                with open(cache_file, 'rb') as f:
-                    self.speaker_embeddings = pickle.load(f)
-                print(f"📂 Loaded {len(self.speaker_embeddings)} embeddings from cache")
+            matrix_file = self.cache_dir / "speaker_matrix.npy"
+            ids_file = self.cache_dir / "speaker_ids.npy"
+            if matrix_file.exists() and ids_file.exists():
+                self._speaker_matrix = np.load(matrix_file, mmap_mode='r')
+                self._speaker_ids = np.load(ids_file)
+                self._has_sermon_mask = None
+                logger.info("Loaded %d embeddings from cache", self._speaker_ids.size)
+                return True
+            
+            # One-time migration from the old pickled {speaker_id: embedding} dict
+            legacy_file = self.cache_dir / "speaker_embeddings.pkl"
+            if legacy_file.exists():
+                with open(legacy_file, 'rb') as f:
+                    legacy_embeddings = pickle.load(f)
+                # Older caches stored raw model output, so normalize once while converting
+                self._rebuild_speaker_matrix({
+                    speaker_id: embedding / np.linalg.norm(embedding)
+                    for speaker_id, embedding in legacy_embeddings.items()
+                })
+                self._save_embeddings_to_cache()
+                logger.info("Migrated %d embeddings from %s", self._speaker_ids.size, legacy_file.name)
                 return True
         except Exception as e:
-            print(f"⚠️ Failed to load cached embeddings: {e}")
+            logger.warning("Failed to load cached embeddings: %s", e)
         return False
     
     def get_ai_recommendations(
@@ -248,41 +543,26 @@ class AIEmbeddingService:
             return []
         
         # Load cached embeddings if not in memory
-        if not self.speaker_embeddings:
+        if not self.has_embeddings():
             if not self._load_embeddings_from_cache():
-                print("⚠️ No cached embeddings found. Generate embeddings first.")
+                logger.warning("No cached embeddings found. Generate embeddings first.")
                 return []
         
         try:
             # Generate user preference embedding
-            user_text = self.prepare_user_preference_text(user, selected_speakers)
-            user_embedding = self.model.encode(user_text)
+            user_embedding = self._encode_user_preferences(user, selected_speakers)
             
             # Get speakers who have sermons (if db session provided)
-            speakers_with_sermons = set()
-            if db:
-                speakers_with_sermons_query = db.query(models.Speaker.id).join(models.Sermon).distinct()
-                speakers_with_sermons = {speaker.id for speaker in speakers_with_sermons_query.all()}
-                print(f"🎯 Found {len(speakers_with_sermons)} speakers with sermons")
-            
-            # Calculate similarities with all speakers
-            similarities = []
-            for speaker_id, speaker_embedding in self.speaker_embeddings.items():
-                # Skip speakers without sermons if we have DB access
-                if db and speakers_with_sermons and speaker_id not in speakers_with_sermons:
-                    continue
-                    
-                similarity = cosine_similarity([user_embedding], [speaker_embedding])[0][0]
-                similarities.append((speaker_id, float(similarity)))
-            
-            # Sort by similarity score (highest first)
-            similarities.sort(key=lambda x: x[1], reverse=True)
-            
-            # Return top recommendations
-            return similarities[:limit]
+            has_sermon_mask = self._get_has_sermon_mask(db) if db else None
+            
+            # Calculate similarities with all speakers (skipping those without sermons)
+            speaker_ids, similarities = self._score_speakers(user_embedding, has_sermon_mask)
+            
+            # Return top recommendations, highest similarity first
+            return self._top_k(speaker_ids, similarities, limit)
             
         except Exception as e:
-            print(f"⚠️ Error generating AI recommendations: {e}")
+            logger.error("Error generating AI recommendations: %s", e)
             return []
     
     def store_ai_recommendations(
@@ -306,32 +586,29 @@ class AIEmbeddingService:
         speaker_ids = [int(rec[0]) for rec in ai_recommendations]
         scores = [float(rec[1]) for rec in ai_recommendations]
         
-        # Check if recommendations already exist for this user
-        existing = db.query(models.Recommendations).filter(
+        # Insert or overwrite in one statement; uq_user_recommendations makes this race-free.
+        # Could add a field to track recommendation_type in future
+        stmt = pg_insert(models.Recommendations).values(
+            user_id=user_id,
+            speaker_ids=speaker_ids,
+            scores=scores
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_user_recommendations',
+            set_={
+                'speaker_ids': stmt.excluded.speaker_ids,
+                'scores': stmt.excluded.scores,
+                # onupdate defaults don't fire for ON CONFLICT, so bump it explicitly
+                'updated_at': func.now()
+            }
+        )
+        db.execute(stmt)
+        db.commit()
+        logger.info("Stored AI recommendations for user %s", user_id)
+        
+        return db.query(models.Recommendations).filter(
             models.Recommendations.user_id == user_id
         ).first()
-        
-        if existing:
-            # Update existing recommendations with AI results
-            existing.speaker_ids = speaker_ids
-            existing.scores = scores
-            # Could add a field to track recommendation_type in future
-            db.commit()
-            db.refresh(existing)
-            print(f"✅ Updated AI recommendations for user {user_id}")
-            return existing
-        else:
-            # Create new recommendations
-            new_recommendations = models.Recommendations(
-                user_id=user_id,
-                speaker_ids=speaker_ids,
-                scores=scores
-            )
-            db.add(new_recommendations)
-            db.commit()
-            db.refresh(new_recommendations)
-            print(f"✅ Stored new AI recommendations for user {user_id}")
-            return new_recommendations
     
     def get_stored_ai_recommendations(
         self,
@@ -354,7 +631,7 @@ class AIEmbeddingService:
     def get_ai_recommendations_with_learning(
         self, 
         user: models.User, 
-        selected_speakers: List[str] = None,
+        selected_speakers: List[models.Speaker] = None,
         limit: int = 10,
         force_refresh: bool = False,
         db: Session = None
@@ -363,7 +640,7 @@ class AIEmbeddingService:
         
         Args:
             user: User object with preferences
-            selected_speakers: List of speaker names selected by user
+            selected_speakers: Already-loaded speakers selected by user
             limit: Maximum number of recommendations
             force_refresh: Force regeneration even if cached
             db: Database session for accessing sermon ratings
@@ -376,16 +653,18 @@ class AIEmbeddingService:
             return []
         
         # Load cached embeddings if not in memory
-        if not self.speaker_embeddings:
+        if not self.has_embeddings():
             if not self._load_embeddings_from_cache():
-                print("⚠️ No cached embeddings found. Generate embeddings first.")
+                logger.warning("No cached embeddings found. Generate embeddings first.")
                 return []
         
         try:
             # Get user's sermon ratings for learning
             user_ratings = []
             if db:
-                ratings = db.query(models.UserSermonPreference).filter(
+                ratings = db.query(models.UserSermonPreference).options(
+                    selectinload(models.UserSermonPreference.sermon).selectinload(models.Sermon.speaker)
+                ).filter(
                     models.UserSermonPreference.user_id == user.id
                 ).all()
                 
@@ -397,44 +676,35 @@ class AIEmbeddingService:
                         'speaker_name': rating.sermon.speaker.name
                     })
                 
-                print(f"🧠 Learning from {len(user_ratings)} user ratings")
+                logger.debug("Learning from %d user ratings", len(user_ratings))
             
             # Generate enhanced user preference embedding with learning
+            selected_speaker_names = [speaker.name for speaker in selected_speakers or []]
             user_text = self.prepare_user_preference_text_with_learning(
-                user, selected_speakers, user_ratings
+                user, selected_speaker_names, user_ratings
             )
-            user_embedding = self.model.encode(user_text)
+            user_embedding = self._encode_user_text(user_text)
             
             # Get speakers who have sermons (if db session provided)
-            speakers_with_sermons = set()
-            if db:
-                speakers_with_sermons_query = db.query(models.Speaker.id).join(models.Sermon).distinct()
-                speakers_with_sermons = {speaker.id for speaker in speakers_with_sermons_query.all()}
-                print(f"🎯 Found {len(speakers_with_sermons)} speakers with sermons")
-            
-            # Calculate similarities with all speakers
-            similarities = []
-            for speaker_id, speaker_embedding in self.speaker_embeddings.items():
-                # Skip speakers without sermons if we have DB access
-                if db and speakers_with_sermons and speaker_id not in speakers_with_sermons:
-                    continue
-                
-                similarity = cosine_similarity([user_embedding], [speaker_embedding])[0][0]
-                
-                # Apply learning boost/penalty based on user ratings
-                learning_adjustment = self._calculate_learning_adjustment(speaker_id, user_ratings)
-                adjusted_similarity = similarity + learning_adjustment
-                
-                similarities.append((speaker_id, float(adjusted_similarity)))
+            has_sermon_mask = self._get_has_sermon_mask(db) if db else None
             
-            # Sort by adjusted similarity score (highest first)
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            # Calculate similarities with all speakers (skipping those without sermons)
+            speaker_ids, similarities = self._score_speakers(user_embedding, has_sermon_mask)
+            
+            # Apply learning boost/penalty based on user ratings
+            adjustment_by_speaker = self._calculate_learning_adjustments(user_ratings)
+            learning_adjustments = np.fromiter(
+                (adjustment_by_speaker.get(int(speaker_id), 0.0) for speaker_id in speaker_ids),
+                dtype=np.float32,
+                count=speaker_ids.size
+            )
+            adjusted_similarities = similarities + learning_adjustments
             
-            # Return top recommendations
-            return similarities[:limit]
+            # Return top recommendations, highest adjusted similarity first
+            return self._top_k(speaker_ids, adjusted_similarities, limit)
             
         except Exception as e:
-            print(f"⚠️ Error generating AI recommendations with learning: {e}")
+            logger.error("Error generating AI recommendations with learning: %s", e)
             return []
     
     def prepare_user_preference_text_with_learning(
@@ -476,25 +746,23 @@ class AIEmbeddingService:
         
         return base_text
     
-    def _calculate_learning_adjustment(self, speaker_id: int, user_ratings: List[Dict]) -> float:
-        """Calculate adjustment to similarity score based on user ratings"""
+    def _calculate_learning_adjustments(self, user_ratings: List[Dict]) -> Dict[int, float]:
+        """Calculate similarity score adjustments per rated speaker in one pass over the ratings"""
         
-        adjustment = 0.0
+        adjustments: Dict[int, float] = {}
         
         for rating in user_ratings:
-            if rating['speaker_id'] == speaker_id:
-                # Direct rating for this speaker
-                if rating['preference'] == 'thumbs_up':
-                    adjustment += 0.15  # Strong positive boost
-                elif rating['preference'] == 'thumbs_down':
-                    adjustment -= 0.20  # Strong negative penalty
+            # Direct rating for this speaker
+            if rating['preference'] == 'thumbs_up':
+                delta = 0.15  # Strong positive boost
+            elif rating['preference'] == 'thumbs_down':
+                delta = -0.20  # Strong negative penalty
             else:
-                # Indirect learning from similar speakers
-                # This could be enhanced with speaker similarity analysis
-                pass
+                continue
+            adjustments[rating['speaker_id']] = adjustments.get(rating['speaker_id'], 0.0) + delta
         
         # Cap adjustments to prevent extreme values
-        return max(-0.3, min(0.3, adjustment))
+        return {speaker_id: max(-0.3, min(0.3, adjustment)) for speaker_id, adjustment in adjustments.items()}
     
     def should_refresh_recommendations(
         self,
@@ -512,11 +780,15 @@ class AIEmbeddingService:
         """
         if not stored_recommendations:
             return True
-            
-        from datetime import datetime, timedelta
         
-        age = datetime.now() - stored_recommendations.updated_at.replace(tzinfo=None)
-        return age > timedelta(hours=max_age_hours)
+        # updated_at is only set on UPDATE, so fall back to created_at for fresh rows
+        refreshed_at = stored_recommendations.updated_at or stored_recommendations.created_at
+        if refreshed_at is None:
+            return True
+        if refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        
+        return refreshed_at < datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
     
     def get_church_recommendations(
         self,
@@ -540,7 +812,9 @@ class AIEmbeddingService:
         
         try:
             # Get user's sermon ratings to understand preferences
-            user_ratings = db.query(models.UserSermonPreference).filter(
+            user_ratings = db.query(models.UserSermonPreference).options(
+                joinedload(models.UserSermonPreference.sermon).joinedload(models.Sermon.speaker)
+            ).filter(
                 models.UserSermonPreference.user_id == user.id
             ).all()
             
@@ -554,16 +828,21 @@ class AIEmbeddingService:
                     if rating.sermon.speaker.church_id:
                         liked_church_ids.append(rating.sermon.speaker.church_id)
             
-            print(f"🏛️ Analyzing {len(liked_speaker_ids)} liked speakers for church recommendations")
+            logger.debug("Analyzing %d liked speakers for church recommendations", len(liked_speaker_ids))
+            
+            # Get all churches with their speakers in one extra query
+            all_churches = db.query(models.Church).options(
+                selectinload(models.Church.speakers)
+            ).filter(models.Church.is_active == True).all()
             
-            # Get all churches
-            all_churches = db.query(models.Church).filter(models.Church.is_active == True).all()
+            # Fraction of (speaker, attribute) pairs matching the user's preferences, per church
+            speaker_match_ratios = self._church_speaker_match_ratios(all_churches, user)
             
             church_scores = []
             
-            for church in all_churches:
+            for church, speaker_match_ratio in zip(all_churches, speaker_match_ratios):
                 score = self._calculate_church_compatibility_score(
-                    church, user, liked_speaker_ids, liked_church_ids, db
+                    church, speaker_match_ratio, user, liked_speaker_ids, liked_church_ids
                 )
                 
                 if score > 0:  # Only include churches with positive scores
@@ -579,7 +858,7 @@ class AIEmbeddingService:
                         'service_times': church.service_times,
                         'compatibility_score': score,
                         'recommendation_reasons': self._get_church_recommendation_reasons(
-                            church, user, liked_speaker_ids, liked_church_ids, db
+                            church, church.speakers, user, liked_church_ids
                         )
                     }
                     church_scores.append(recommendation)
@@ -590,16 +869,45 @@ class AIEmbeddingService:
             return church_scores[:limit]
             
         except Exception as e:
-            print(f"⚠️ Error generating church recommendations: {e}")
+            logger.error("Error generating church recommendations: %s", e)
             return []
     
+    def _church_speaker_match_ratios(self, churches: List[models.Church], user: models.User) -> np.ndarray:
+        """Per-church ratio of speaker attributes matching the user's preferences
+        
+        Speakers are flattened into parallel code arrays so the three attribute checks
+        run as NumPy comparisons, and per-church totals come from one bincount each.
+        Churches without speakers get NaN.
+        """
+        speakers = [(church_idx, speaker) for church_idx, church in enumerate(churches) for speaker in church.speakers]
+        count = len(speakers)
+        church_idx = np.fromiter((idx for idx, _ in speakers), dtype=np.int64, count=count)
+        
+        matches = np.zeros(count, dtype=np.int64)
+        for attr, codes, preference in (
+            ('teaching_style', _TEACHING_STYLE_CODES, user.teaching_style_preference),
+            ('bible_approach', _BIBLE_APPROACH_CODES, user.bible_reading_preference),
+            ('environment_style', _ENV_STYLE_CODES, user.environment_preference),
+        ):
+            if not preference:
+                continue
+            speaker_codes = np.fromiter(
+                (codes.get(getattr(speaker, attr), -1) for _, speaker in speakers), dtype=np.int8, count=count
+            )
+            matches += speaker_codes == codes.get(preference, -2)
+        
+        compatible_by_church = np.bincount(church_idx, weights=matches, minlength=len(churches))
+        speakers_by_church = np.bincount(church_idx, minlength=len(churches))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return compatible_by_church / (speakers_by_church * 3)  # 3 attributes checked
+    
     def _calculate_church_compatibility_score(
         self,
         church: models.Church,
+        speaker_match_ratio: float,
         user: models.User,
         liked_speaker_ids: List[int],
-        liked_church_ids: List[int],
-        db: Session
+        liked_church_ids: List[int]
     ) -> float:
         """Calculate compatibility score between user and church"""
         
@@ -610,43 +918,12 @@ class AIEmbeddingService:
             score += 0.4  # Strong positive signal
         
         # 2. Speaker compatibility (church has speakers similar to liked ones)
-        church_speakers = db.query(models.Speaker).filter(
-            models.Speaker.church_id == church.id
-        ).all()
-        
-        if church_speakers and liked_speaker_ids:
-            # Check if church speakers match user's preferences
-            compatible_speakers = 0
-            for speaker in church_speakers:
-                # Check teaching style match
-                if user.teaching_style_preference and speaker.teaching_style == user.teaching_style_preference:
-                    compatible_speakers += 1
-                # Check bible approach match
-                if user.bible_reading_preference and speaker.bible_approach == user.bible_reading_preference:
-                    compatible_speakers += 1
-                # Check environment match
-                if user.environment_preference and speaker.environment_style == user.environment_preference:
-                    compatible_speakers += 1
-            
-            if church_speakers:
-                compatibility_ratio = compatible_speakers / (len(church_speakers) * 3)  # 3 attributes checked
-                score += compatibility_ratio * 0.3
+        if liked_speaker_ids and not np.isnan(speaker_match_ratio):
+            score += float(speaker_match_ratio) * 0.3
         
         # 3. Denomination/environment preference alignment
         if user.environment_preference:
-            # Map denominations to likely environment preferences
-            denomination_environment_map = {
-                'Presbyterian': models.EnvironmentStyle.TRADITIONAL,
-                'Catholic': models.EnvironmentStyle.TRADITIONAL,
-                'Lutheran': models.EnvironmentStyle.TRADITIONAL,
-                'Methodist': models.EnvironmentStyle.BLENDED,
-                'Baptist': models.EnvironmentStyle.TRADITIONAL,
-                'Non-denominational': models.EnvironmentStyle.CONTEMPORARY,
-                'Assembly of God': models.EnvironmentStyle.CONTEMPORARY,
-                'Pentecostal': models.EnvironmentStyle.CONTEMPORARY
-            }
-            
-            expected_env = denomination_environment_map.get(church.denomination)
+            expected_env = _DENOM_ENV_MAP.get(church.denomination)
             if expected_env == user.environment_preference:
                 score += 0.2
         
@@ -660,10 +937,9 @@ class AIEmbeddingService:
     def _get_church_recommendation_reasons(
         self,
         church: models.Church,
+        church_speakers: List[models.Speaker],
         user: models.User,
-        liked_speaker_ids: List[int],
-        liked_church_ids: List[int],
-        db: Session
+        liked_church_ids: List[int]
     ) -> List[str]:
         """Get single-word reasons for church recommendation (for pills)"""
         
@@ -673,41 +949,25 @@ class AIEmbeddingService:
         if church.id in liked_church_ids:
             reasons.append("Liked")
         
-        # Check preference alignments
-        church_speakers = db.query(models.Speaker).filter(
-            models.Speaker.church_id == church.id
-        ).all()
-        
-        if church_speakers:
-            for speaker in church_speakers:
-                if user.teaching_style_preference and speaker.teaching_style == user.teaching_style_preference:
-                    if user.teaching_style_preference.value == "warm_and_conversational":
-                        reasons.append("Conversational")
-                    elif user.teaching_style_preference.value == "passionate_and_high_energy":
-                        reasons.append("Energetic")
-                    elif user.teaching_style_preference.value == "calm_and_reflective":
-                        reasons.append("Reflective")
-                    break
-            
-            for speaker in church_speakers:
-                if user.bible_reading_preference and speaker.bible_approach == user.bible_reading_preference:
-                    if user.bible_reading_preference.value == "more_scripture":
-                        reasons.append("Scripture-focused")
-                    elif user.bible_reading_preference.value == "more_application":
-                        reasons.append("Practical")
-                    elif user.bible_reading_preference.value == "balanced":
-                        reasons.append("Balanced")
-                    break
-            
-            for speaker in church_speakers:
-                if user.environment_preference and speaker.environment_style == user.environment_preference:
-                    if user.environment_preference.value == "traditional":
-                        reasons.append("Traditional")
-                    elif user.environment_preference.value == "contemporary":
-                        reasons.append("Contemporary")
-                    elif user.environment_preference.value == "blended":
-                        reasons.append("Blended")
-                    break
+        # Check preference alignments in one pass over the speakers
+        teaching_pref = user.teaching_style_preference
+        bible_pref = user.bible_reading_preference
+        env_pref = user.environment_preference
+        teaching_match = bible_match = env_match = False
+        for speaker in church_speakers:
+            teaching_match = teaching_match or (bool(teaching_pref) and speaker.teaching_style == teaching_pref)
+            bible_match = bible_match or (bool(bible_pref) and speaker.bible_approach == bible_pref)
+            env_match = env_match or (bool(env_pref) and speaker.environment_style == env_pref)
+            if teaching_match and bible_match and env_match:
+                break
+        
+        for matched, reason_map, preference in (
+            (teaching_match, _TEACHING_STYLE_REASON, teaching_pref),
+            (bible_match, _BIBLE_APPROACH_REASON, bible_pref),
+            (env_match, _ENV_STYLE_REASON, env_pref),
+        ):
+            if matched and preference in reason_map:
+                reasons.append(reason_map[preference])
         
         # Add denomination as a single word
         if church.denomination:
@@ -729,8 +989,8 @@ class AIEmbeddingService:
         recommended_speakers: List[Tuple[int, float]],
         db: Session,
         limit: int = 10
-    ) -> List[Dict]:
-        """Get sermon clips from recommended speakers"""
+    ) -> List[SermonRecommendation]:
+        """Get sermon clips from recommended speakers, as response-ready schemas"""
         
         if not recommended_speakers:
             return []
@@ -739,47 +999,60 @@ class AIEmbeddingService:
         speaker_ids = [speaker_id for speaker_id, score in recommended_speakers]
         speaker_scores = {speaker_id: score for speaker_id, score in recommended_speakers}
         
-        # Get sermon clips from these speakers
-        sermons = db.query(models.Sermon).join(models.Speaker).filter(
-            models.Speaker.id.in_(speaker_ids),
+        # Get sermon clips from these speakers, loading each speaker in the same query
+        sermons = db.query(models.Sermon).options(
+            joinedload(models.Sermon.speaker)
+        ).filter(
+            models.Sermon.speaker_id.in_(speaker_ids),
             models.Sermon.is_clip == True  # Only clips for recommendations
         ).all()
         
-        # Create recommendation objects with scores
-        recommendations = []
-        for sermon in sermons:
-            speaker_score = speaker_scores.get(sermon.speaker_id, 0.0)
-            
-            recommendation = {
-                "sermon_id": sermon.id,
-                "title": sermon.title,
-                "description": sermon.description,
-                "gcs_url": sermon.gcs_url,
-                "speaker": {
-                    "id": sermon.speaker.id,
-                    "name": sermon.speaker.name,
-                    "title": sermon.speaker.title,
-                    "profile_picture_url": sermon.speaker.profile_picture_url,
-                    "teaching_style": sermon.speaker.teaching_style,
-                    "bible_approach": sermon.speaker.bible_approach,
-                    "environment_style": sermon.speaker.environment_style,
-                    "gender": sermon.speaker.gender
-                },
-                "recommendation_score": speaker_score,
-                "matching_reason": "Compatible"
-            }
-            recommendations.append(recommendation)
-        
-        # Sort by speaker recommendation score
-        recommendations.sort(key=lambda x: x["recommendation_score"], reverse=True)
+        # Pick the top `limit` sermons by speaker score before building any payloads
+        top_sermons = heapq.nlargest(
+            limit,
+            ((sermon, speaker_scores.get(sermon.speaker_id, 0.0)) for sermon in sermons),
+            key=lambda pair: pair[1]
+        )
         
-        return recommendations[:limit]
+        # Build response schemas directly from the ORM rows; values are already
+        # typed (enum members, ints), so validation is skipped with model_construct
+        recommendations = []
+        for sermon, speaker_score in top_sermons:
+            speaker = sermon.speaker
+            speaker_info = SpeakerInfo.model_construct(
+                id=speaker.id,
+                name=speaker.name,
+                title=speaker.title,
+                teaching_style=speaker.teaching_style,
+                bible_approach=speaker.bible_approach,
+                environment_style=speaker.environment_style,
+                gender=speaker.gender
+            )
+            recommendations.append(SermonRecommendation.model_construct(
+                sermon_id=sermon.id,
+                title=sermon.title,
+                description=sermon.description,
+                gcs_url=sermon.gcs_url,
+                speaker=speaker_info,
+                matching_preferences=["Compatible"],
+                recommendation_score=speaker_score
+            ))
+        
+        return recommendations
 
 
 # Global service instance
 ai_service = AIEmbeddingService()
 
 
+@event.listens_for(models.Sermon, "after_insert")
+@event.listens_for(models.Sermon, "after_update")
+@event.listens_for(models.Sermon, "after_delete")
+def _sermon_changed(mapper, connection, target):
+    # Sermon writes can change which speakers have sermons; don't wait out the TTL
+    ai_service.invalidate_has_sermon_mask()
+
+
 def get_ai_service() -> AIEmbeddingService:
     """Get the global AI embedding service instance"""
     return ai_service
@@ -802,27 +1075,26 @@ def trigger_ai_recommendation_update(user_id: int, db: Session) -> bool:
         from app.db import models
         user = db.query(models.User).filter(models.User.id == user_id).first()
         if not user:
-            print(f"⚠️ User {user_id} not found for AI recommendation update")
+            logger.warning("User %s not found for AI recommendation update", user_id)
             return False
         
         # Get AI service
         ai_service = get_ai_service()
         if not ai_service.is_available():
-            print(f"⚠️ AI service not available for user {user_id} recommendation update")
+            logger.warning("AI service not available for user %s recommendation update", user_id)
             return False
         
         # Get user's selected speakers for context (if any)
         selected_speakers = db.query(models.Speaker).join(models.UserSpeakerPreference).filter(
             models.UserSpeakerPreference.user_id == user_id
         ).all()
-        selected_speaker_names = [speaker.name for speaker in selected_speakers]
         
-        print(f"🤖 Generating fresh AI recommendations for user {user_id} based on sermon preferences")
+        logger.info("Generating fresh AI recommendations for user %s based on sermon preferences", user_id)
         
         # Generate fresh AI recommendations with learning from sermon preferences
         ai_speaker_recs = ai_service.get_ai_recommendations_with_learning(
             user, 
-            selected_speaker_names, 
+            selected_speakers, 
             limit=20,  # Get a good number of recommendations
             force_refresh=True,  # Force fresh generation
             db=db  # Pass database session for learning from ratings
@@ -831,12 +1103,12 @@ def trigger_ai_recommendation_update(user_id: int, db: Session) -> bool:
         # Store the updated recommendations
         if ai_speaker_recs:
             ai_service.store_ai_recommendations(db, user_id, ai_speaker_recs)
-            print(f"✅ Successfully updated AI recommendations for user {user_id} ({len(ai_speaker_recs)} speakers)")
+            logger.info("Successfully updated AI recommendations for user %s (%d speakers)", user_id, len(ai_speaker_recs))
             return True
         else:
-            print(f"⚠️ No AI recommendations generated for user {user_id}")
+            logger.warning("No AI recommendations generated for user %s", user_id)
             return False
             
     except Exception as e:
-        print(f"❌ Error updating AI recommendations for user {user_id}: {e}")
+        logger.error("Error updating AI recommendations for user %s: %s", user_id, e)
         return False
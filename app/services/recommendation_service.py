@@ -7,29 +7,51 @@ and manages the storage/retrieval of recommendations in the database.
 
 import json
 import logging
+import sys
+from functools import lru_cache
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
 import torch
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import FrozenSet, List, Dict, Tuple, Optional
+from sqlalchemy import event, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.db import models
 from app.models.schemas import User
-from model.inference_service import get_model_service
+from model.utils.scoring import build_item_matrix, build_trait_index, candidates_to_device
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Import your model utilities
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'model'))
+# Seconds to reuse the set of speakers that have sermons before re-querying
+SPEAKERS_WITH_SERMONS_TTL = 60
+
+# Max number of distinct trait sets / swipe histories whose query vectors are memoized
+VECTOR_CACHE_SIZE = 1024
+
+# Max number of distinct trait lists whose trait id conversions are memoized
+TRAIT_IDS_CACHE_SIZE = 2048
+
+# Mappings and item matrix saved next to the model artifacts so later loads skip the CSVs
+PRECOMPUTED_FILE = "precomputed.pt"
+
+# Training code lives in model/ and imports its siblings as top-level packages (`classes`, `utils`)
+MODEL_DIR = Path(__file__).resolve().parent.parent.parent / "model"
+
 
-try:
-    from model.utils.save_or_load import load_artifacts
-    from model.utils.model import build_mappings
-    import pandas as pd
-except ImportError:
-    # Fallback for development/testing when model artifacts aren't available
-    print("Warning: ML model utilities not available. Using mock recommendations.")
+def _ensure_model_path() -> None:
+    """Make model/ importable; called right before the model utilities are first imported."""
+    model_dir = str(MODEL_DIR)
+    if model_dir not in sys.path:
+        sys.path.append(model_dir)
+
+
+def _score_fn(V_all: torch.Tensor, bias_all: torch.Tensor, cand_idx: torch.Tensor, q: torch.Tensor, inv_scale: float) -> torch.Tensor:
+    """bias + (V @ q) / scale over the candidate rows; compiled, the gather fuses into the reduction."""
+    return (V_all.index_select(0, cand_idx) @ q) * inv_scale + bias_all.index_select(0, cand_idx)
 
 
 class MLRecommendationService:
@@ -47,38 +69,126 @@ class MLRecommendationService:
         self.pastor_trait_ids = None
         self.pastor2idx = None
         self.trait2idx = None
+        self.idx2speaker_id = None  # np.ndarray: internal pastor idx -> speaker_id
         self.model_loaded = False
+        # Concatenated trait ids of every pastor plus per-pastor start/length; only built when
+        # the item matrix has to be recomputed (no usable precomputed file)
+        self._flat_all = None
+        self._starts_all = None
+        self._lens_all = None
+        # Item vectors and biases for every pastor; fixed for the lifetime of the loaded model
+        self._V_all = None
+        self._bias_all = None
+        self._speakers_with_sermons_cache: Optional[Tuple[float, FrozenSet[int]]] = None
+        # Per-thread pinned host buffer for candidate indices, only used on CUDA
+        self._pinned = threading.local()
+        # torch.compile'd _score_fn (CUDA only); None means score eagerly with addmv
+        self._compiled_score_fn = None
+        # Runs the speakers-with-sermons lookup while query vectors are built
+        self._db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ml-recs-db")
+        # Per-instance memoization of query vectors; keys are order-independent tuples
+        self._preference_vector_cache = lru_cache(maxsize=VECTOR_CACHE_SIZE)(self._compute_preference_vector)
+        self._behavior_vector_cache = lru_cache(maxsize=VECTOR_CACHE_SIZE)(self._compute_behavior_vector)
+        # trait2idx is fixed once the model is loaded, so conversions can be memoized too
+        self._trait_ids_cache = lru_cache(maxsize=TRAIT_IDS_CACHE_SIZE)(self._compute_trait_ids)
         
         if model_path is None:
-            model_path = Path(__file__).parent.parent.parent / "model" / "artifacts" / "model_1759812063"
+            model_path = MODEL_DIR / "artifacts" / "model_1759812063"
         
         self._load_model(model_path)
     
     def _load_model(self, model_path: Path) -> None:
         """Load the trained ML model and associated artifacts."""
         try:
+            # Imported here so a missing model package or pandas only disables ML recommendations,
+            # and their import cost is paid on first load rather than at app startup
+            _ensure_model_path()
+            from model.utils.save_or_load import load_artifacts
+            from model.utils.model import build_mappings
+            
             # Load model artifacts
             self.model, self.user_enc, self.pastor_enc, self.pastor_trait_ids, _, _ = load_artifacts(model_path)
+            self.model.eval()
+            if next(self.model.parameters()).device.type == 'cuda':
+                # bf16 halves embedding bandwidth; scores are cast back to fp32 before ranking
+                self.model = self.model.to(dtype=torch.bfloat16)
             
             # Load data to rebuild mappings
-            ratings_path = Path(__file__).parent.parent.parent / "model" / "data" / "pastor_ratings.csv"
-            pastor_path = Path(__file__).parent.parent.parent / "model" / "data" / "pastor_traits.csv"
+            ratings_path = MODEL_DIR / "data" / "pastor_ratings.csv"
+            pastor_path = MODEL_DIR / "data" / "pastor_traits.csv"
+            precomputed_path = Path(model_path) / PRECOMPUTED_FILE
             
-            if ratings_path.exists() and pastor_path.exists():
+            if self._load_precomputed(precomputed_path, [Path(model_path) / "checkpoint.pt", ratings_path, pastor_path]):
+                logger.info("Loaded precomputed mappings and item matrix from %s", precomputed_path)
+            elif ratings_path.exists() and pastor_path.exists():
+                import pandas as pd
+                
                 rating_df = pd.read_csv(ratings_path)
                 pastor_df = pd.read_csv(pastor_path)
                 
                 # Rebuild mappings
                 user2idx, self.pastor2idx, self.trait2idx, _ = build_mappings(rating_df, pastor_df)
-                
-                self.model_loaded = True
-                print("✅ ML model loaded successfully")
+                device = next(self.model.parameters()).device
+                self._flat_all, self._starts_all, self._lens_all = build_trait_index(self.pastor_trait_ids, device)
+                self._V_all, self._bias_all = build_item_matrix(self.model, self._flat_all, self._starts_all)
+                self._save_precomputed(precomputed_path)
             else:
-                print("⚠️ Model data files not found, using fallback recommendations")
+                logger.warning("Model data files not found, using fallback recommendations")
+                return
+            
+            self.idx2speaker_id = np.zeros(max(self.pastor2idx.values()) + 1, dtype=np.int64)
+            for speaker_id, idx in self.pastor2idx.items():
+                self.idx2speaker_id[idx] = speaker_id
+            self._compile_score_fn()
+            
+            self.model_loaded = True
+            logger.info("ML model loaded successfully")
                 
         except Exception as e:
-            print(f"⚠️ Failed to load ML model: {e}")
-            print("Using fallback recommendations")
+            logger.warning("Failed to load ML model: %s. Using fallback recommendations", e)
+    
+    @torch.inference_mode()
+    def _compile_score_fn(self) -> None:
+        """Compile _score_fn with a dynamic candidate dimension and trace it once at load."""
+        if self._V_all.device.type != 'cuda':
+            return
+        try:
+            fn = torch.compile(_score_fn, dynamic=True)
+            idx = torch.zeros(min(len(self.idx2speaker_id), 2), dtype=torch.long, device=self._V_all.device)
+            q = torch.zeros(self._V_all.shape[1], dtype=self._V_all.dtype, device=self._V_all.device)
+            fn(self._V_all, self._bias_all, idx, q, 1.0 / self.model._scale)
+            self._compiled_score_fn = fn
+        except Exception as e:
+            logger.warning("torch.compile unavailable, scoring eagerly: %s", e)
+    
+    def _load_precomputed(self, path: Path, sources: List[Path]) -> bool:
+        """Restore mappings and item tensors from path unless it is missing or older than any source."""
+        if not path.exists():
+            return False
+        cached_mtime = path.stat().st_mtime
+        if any(src.exists() and src.stat().st_mtime > cached_mtime for src in sources):
+            logger.info("Precomputed artifacts at %s are stale, rebuilding", path)
+            return False
+        
+        param = next(self.model.parameters())
+        blob = torch.load(path, map_location='cpu')
+        self.pastor2idx = blob['pastor2idx']
+        self.trait2idx = blob['trait2idx']
+        self._V_all = blob['V_all'].to(device=param.device, dtype=param.dtype)
+        self._bias_all = blob['bias_all'].to(device=param.device, dtype=param.dtype)
+        return True
+    
+    def _save_precomputed(self, path: Path) -> None:
+        try:
+            torch.save({
+                # Plain ints so the blob stays loadable with weights_only=True
+                'pastor2idx': {int(k): int(v) for k, v in self.pastor2idx.items()},
+                'trait2idx': {str(k): int(v) for k, v in self.trait2idx.items()},
+                'V_all': self._V_all.float().cpu(),
+                'bias_all': self._bias_all.float().cpu(),
+            }, path)
+        except Exception as e:
+            logger.warning("Could not save precomputed artifacts to %s: %s", path, e)
     
     def generate_recommendations(
         self, 
@@ -98,84 +208,99 @@ class MLRecommendationService:
         Returns:
             List of tuples (speaker_id, confidence_score)
         """
-        logger.info(f"Starting recommendation generation - limit: {limit}, model_loaded: {self.model_loaded}")
-        logger.debug(f"User preferences: {user_preferences}")
-        logger.debug(f"User swipes count: {len(user_swipes) if user_swipes else 0}")
+        logger.info("Starting recommendation generation - limit: %s, model_loaded: %s", limit, self.model_loaded)
+        logger.debug("User preferences: %s", user_preferences)
+        logger.debug("User swipes count: %s", len(user_swipes) if user_swipes else 0)
         
         if not self.model_loaded:
             logger.warning("ML model not loaded, using fallback recommendations")
             return self._get_fallback_recommendations(limit, db)
         
+        # Overlap the DB round trip with building the query vector; the session is
+        # not touched on this thread again until the future has completed
+        speakers_future = self._db_executor.submit(self._get_speakers_with_sermons, db) if db else None
+        
         try:
             # This is a simplified version of your query_model.py logic
             device = next(self.model.parameters()).device
             d = self.model.user_embed.embedding_dim
-            logger.debug(f"Model device: {device}, embedding_dim: {d}")
+            logger.debug("Model device: %s, embedding_dim: %s", device, d)
             
             # Build preference vector from user traits
             trait_choices = user_preferences.get('trait_choices', [])
-            logger.debug(f"Trait choices from preferences: {trait_choices}")
+            logger.debug("Trait choices from preferences: %s", trait_choices)
             
             trait_ids = self._traits_to_trait_ids(trait_choices)
-            logger.debug(f"Converted trait IDs: {trait_ids}")
+            logger.debug("Converted trait IDs: %s", trait_ids)
             
             p = self._build_preference_vector(trait_ids, device)
-            logger.debug(f"Preference vector shape: {p.shape}, norm: {p.norm().item():.4f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Preference vector shape: %s, norm: %.4f", p.shape, p.norm().item())
             
             # Build behavior vector from swipes if available
             u = torch.zeros(d, device=device)
             if user_swipes:
-                logger.debug(f"Building behavior vector from {len(user_swipes)} swipes")
+                logger.debug("Building behavior vector from %s swipes", len(user_swipes))
                 u = self._build_behavior_vector(user_swipes, device)
-                logger.debug(f"Behavior vector shape: {u.shape}, norm: {u.norm().item():.4f}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Behavior vector shape: %s, norm: %.4f", u.shape, u.norm().item())
             else:
                 logger.debug("No user swipes provided, using zero behavior vector")
             
             # Blend preferences and behavior
             alpha = 0.4
             q = (1 - alpha) * u + alpha * p
-            logger.debug(f"Blended query vector (alpha={alpha}) shape: {q.shape}, norm: {q.norm().item():.4f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Blended query vector (alpha=%s) shape: %s, norm: %.4f", alpha, q.shape, q.norm().item())
             
             # Score all candidates
             logger.debug("Starting candidate scoring...")
-            candidate_scores = self._score_candidates(q, user_swipes or [], db)
-            logger.info(f"Scored {len(candidate_scores)} candidates")
+            speakers_with_sermons = speakers_future.result() if speakers_future else frozenset()
+            candidate_scores = self._score_candidates(q, user_swipes or [], limit, speakers_with_sermons)
+            logger.info("Selected %s top candidates", len(candidate_scores))
             
             # If no candidates found, fall back to fallback recommendations
             if not candidate_scores:
                 logger.warning("No candidates found in ML model, falling back to fallback recommendations")
                 return self._get_fallback_recommendations(limit, db)
             
-            # Return top K recommendations
-            top_k = min(limit, len(candidate_scores))
-            final_recommendations = candidate_scores[:top_k]
-            logger.info(f"Returning {len(final_recommendations)} recommendations (top {top_k} of {len(candidate_scores)})")
-            logger.debug(f"Top recommendations: {final_recommendations[:5]}")  # Log first 5 for debugging
+            # Candidates come back already limited to the top K, best first
+            logger.info("Returning %s recommendations", len(candidate_scores))
+            logger.debug("Top recommendations: %s", candidate_scores[:5])  # Log first 5 for debugging
             
-            return final_recommendations
+            return candidate_scores
             
         except Exception as e:
-            logger.error(f"Error generating ML recommendations: {e}", exc_info=True)
+            logger.error("Error generating ML recommendations: %s", e, exc_info=True)
+            if speakers_future:
+                wait([speakers_future])
             return self._get_fallback_recommendations(limit, db)
     
-    def _traits_to_trait_ids(self, traits: List[str]) -> List[int]:
-        """Convert trait names to trait IDs."""
+    def _traits_to_trait_ids(self, traits: List[str]) -> Tuple[int, ...]:
+        """Convert trait names to trait IDs (memoized per trait list)."""
+        return self._trait_ids_cache(tuple(traits))
+    
+    def _compute_trait_ids(self, traits: Tuple[str, ...]) -> Tuple[int, ...]:
         if not self.trait2idx:
             logger.warning("trait2idx mapping not available")
-            return []
+            return ()
         
         trait_ids = []
         for trait in traits:
             if trait in self.trait2idx:
                 trait_ids.append(self.trait2idx[trait])
             else:
-                logger.debug(f"Trait '{trait}' not found in trait2idx mapping")
+                logger.debug("Trait '%s' not found in trait2idx mapping", trait)
         
-        logger.debug(f"Converted {len(traits)} traits to {len(trait_ids)} trait IDs")
-        return trait_ids
+        logger.debug("Converted %s traits to %s trait IDs", len(traits), len(trait_ids))
+        return tuple(trait_ids)  # Cached and shared between requests, so immutable
+    
+    def _build_preference_vector(self, trait_ids: Tuple[int, ...], device) -> torch.Tensor:
+        """Build preference vector from trait IDs (memoized per trait set; do not modify in place)."""
+        return self._preference_vector_cache(tuple(sorted(trait_ids)), device)
     
-    def _build_preference_vector(self, trait_ids: List[int], device) -> torch.Tensor:
-        """Build preference vector from trait IDs."""
+    @torch.no_grad()
+    def _compute_preference_vector(self, trait_ids: Tuple[int, ...], device) -> torch.Tensor:
         if not trait_ids:
             d = self.model.user_embed.embedding_dim
             logger.debug("No trait IDs provided, returning zero preference vector")
@@ -184,140 +309,147 @@ class MLRecommendationService:
         idx = torch.tensor(trait_ids, dtype=torch.long, device=device)
         emb = self.model.trait_bag.weight.index_select(0, idx)
         result = emb.mean(dim=0)
-        logger.debug(f"Built preference vector from {len(trait_ids)} traits, shape: {result.shape}")
+        logger.debug("Built preference vector from %s traits, shape: %s", len(trait_ids), result.shape)
         return result
     
     def _build_behavior_vector(self, user_swipes: List[Dict], device) -> torch.Tensor:
-        """Build behavior vector from user swipes/ratings."""
-        d = self.model.user_embed.embedding_dim
-        liked_vs, disliked_vs = [], []
+        """Build behavior vector from user swipes/ratings (memoized per swipe history; do not modify in place)."""
+        swipe_key = tuple(sorted(
+            (int(swipe.get('speaker_id', 0)), float(swipe.get('rating', 0)) >= 4.0)
+            for swipe in user_swipes
+        ))
+        return self._behavior_vector_cache(swipe_key, device)
+    
+    @torch.no_grad()
+    def _compute_behavior_vector(self, swipe_key: Tuple[Tuple[int, bool], ...], device) -> torch.Tensor:
         skipped_swipes = 0
         
-        logger.debug(f"Processing {len(user_swipes)} swipes for behavior vector")
+        logger.debug("Processing %s swipes for behavior vector", len(swipe_key))
         
-        for swipe in user_swipes:
-            speaker_id = int(swipe.get('speaker_id', 0))
-            rating = float(swipe.get('rating', 0))
-            
-            if speaker_id not in self.pastor2idx:
+        liked_idxs, disliked_idxs = [], []
+        for speaker_id, liked in swipe_key:
+            idx = self.pastor2idx.get(speaker_id)
+            if idx is None:
                 skipped_swipes += 1
-                logger.debug(f"Skipping swipe for speaker_id {speaker_id} (not in pastor2idx)")
+                logger.debug("Skipping swipe for speaker_id %s (not in pastor2idx)", speaker_id)
                 continue
-                
-            idx = self.pastor2idx[speaker_id]
-            v_id = self.model.pastor_id_emb.weight[idx]
-            f_ids = self.pastor_trait_ids[idx].to(device)
-            v_feat = self.model.trait_bag.weight[f_ids].mean(0)
-            v = v_id + v_feat
-            
-            if rating >= 4.0:
-                liked_vs.append(v)
-            else:
-                disliked_vs.append(v)
+            (liked_idxs if liked else disliked_idxs).append(idx)
         
-        logger.debug(f"Processed swipes: {len(liked_vs)} liked, {len(disliked_vs)} disliked, {skipped_swipes} skipped")
+        logger.debug("Processed swipes: %s liked, %s disliked, %s skipped", len(liked_idxs), len(disliked_idxs), skipped_swipes)
         
-        v_like = torch.stack(liked_vs, dim=0).mean(0) if liked_vs else torch.zeros(d, device=device)
-        v_dis = torch.stack(disliked_vs, dim=0).mean(0) if disliked_vs else torch.zeros(d, device=device)
+        # Item vectors are precomputed in _V_all, so this is a row gather rather than
+        # a per-swipe trait-bag mean
+        v_like = self._mean_item_vector(liked_idxs, device)
+        v_dis = self._mean_item_vector(disliked_idxs, device)
         
         result = v_like - 0.5 * v_dis
-        logger.debug(f"Behavior vector shape: {result.shape}, norm: {result.norm().item():.4f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Behavior vector shape: %s, norm: %.4f", result.shape, result.norm().item())
         return result
     
-    def _score_candidates(self, query_vector: torch.Tensor, user_swipes: List[Dict], db: Session = None) -> List[Tuple[int, float]]:
-        """Score all candidate speakers against the query vector."""
+    def _mean_item_vector(self, idxs: List[int], device) -> torch.Tensor:
+        """Mean of the precomputed item vectors at idxs, or zeros if idxs is empty."""
+        if not idxs:
+            return torch.zeros(self._V_all.shape[1], dtype=self._V_all.dtype, device=device)
+        idx_t = torch.tensor(idxs, dtype=torch.long, device=self._V_all.device)
+        return self._V_all.index_select(0, idx_t).mean(0).to(device)
+    
+    @torch.inference_mode()
+    def _score_candidates(
+        self,
+        query_vector: torch.Tensor,
+        user_swipes: List[Dict],
+        limit: int,
+        speakers_with_sermons: FrozenSet[int] = frozenset()
+    ) -> List[Tuple[int, float]]:
+        """Score all candidate speakers against the query vector and return the top `limit`, best first.
+        
+        An empty speakers_with_sermons set means no sermon filtering is applied.
+        """
         device = query_vector.device
-        logger.debug(f"Scoring candidates on device: {device}")
+        logger.debug("Scoring candidates on device: %s", device)
         
         # Get already-swiped speaker IDs
         swiped_ids = {int(s.get('speaker_id', 0)) for s in user_swipes}
-        logger.debug(f"Swiped speaker IDs: {swiped_ids}")
+        logger.debug("Swiped speaker IDs: %s", swiped_ids)
         
-        # Get speakers with sermons if DB session provided
-        speakers_with_sermons = set()
-        if db:
-            from app.db import models
-            speakers_with_sermons_query = db.query(models.Speaker.id).join(models.Sermon).distinct()
-            speakers_with_sermons = {speaker.id for speaker in speakers_with_sermons_query.all()}
-            logger.info(f"Found {len(speakers_with_sermons)} speakers with sermons in database")
-        
-        # Get candidate indices (exclude already swiped and speakers without sermons)
-        cand_idxs = []
-        excluded_swiped = 0
-        excluded_no_sermons = 0
-        
-        for speaker_id, idx in self.pastor2idx.items():
-            if speaker_id in swiped_ids:
-                excluded_swiped += 1
-                continue
-            if db and speakers_with_sermons and speaker_id not in speakers_with_sermons:
-                excluded_no_sermons += 1
-                continue
-            cand_idxs.append(idx)
+        # Get candidate indices (exclude already swiped and speakers without sermons);
+        # idx2speaker_id is aligned with pastor indices, so this is a vectorized mask
+        not_swiped = ~np.isin(self.idx2speaker_id, list(swiped_ids))
+        mask = not_swiped
+        if speakers_with_sermons:
+            mask = mask & np.isin(self.idx2speaker_id, list(speakers_with_sermons))
+        cand_idxs = np.flatnonzero(mask)
         
-        logger.info(f"Found {len(cand_idxs)} candidate speakers out of {len(self.pastor2idx)} total speakers in model")
-        logger.debug(f"Excluded {excluded_swiped} already swiped speakers, {excluded_no_sermons} speakers without sermons")
+        logger.info("Found %s candidate speakers out of %s total speakers in model", cand_idxs.size, len(self.pastor2idx))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Excluded %s already swiped speakers, %s speakers without sermons", int((~not_swiped).sum()), int((not_swiped & ~mask).sum()))
         
-        if not cand_idxs:
+        if cand_idxs.size == 0:
             logger.warning("No candidate speakers found - all speakers either swiped or don't have sermons")
             return []
         
-        cand_idx_t = torch.tensor(cand_idxs, dtype=torch.long, device=device)
-        logger.debug(f"Created candidate tensor with shape: {cand_idx_t.shape}")
-        
-        # Build trait bags for all candidates
-        flat, offsets, total = [], [0], 0
-        for i in cand_idxs:
-            f = self.pastor_trait_ids[i].tolist()
-            flat.extend(f)
-            total += len(f)
-            offsets.append(total)
-        
-        flat_t = torch.tensor(flat, dtype=torch.long, device=device)
-        offsets_t = torch.tensor(offsets[:-1], dtype=torch.long, device=device)
-        logger.debug(f"Built trait bags: {len(flat)} total traits, {len(offsets)-1} candidates")
-        
-        # Calculate item vectors
-        v_id = self.model.pastor_id_emb(cand_idx_t)
-        v_feat = self.model.trait_bag(flat_t, offsets_t)
-        V = v_id + v_feat
-        logger.debug(f"Item vectors shape: {V.shape}")
-        
-        # Calculate scores
-        dot = (V * query_vector.unsqueeze(0)).sum(-1) / self.model._scale
-        bias = self.model.global_bias + self.model.pastor_bias(cand_idx_t).squeeze(-1)
-        scores = (dot + bias).detach().cpu()
-        logger.debug(f"Score statistics - min: {scores.min().item():.4f}, max: {scores.max().item():.4f}, mean: {scores.mean().item():.4f}")
-        
-        # Convert to (speaker_id, score) tuples and sort
-        idx2speaker_id = {v: k for k, v in self.pastor2idx.items()}
-        results = [(int(idx2speaker_id[cand_idxs[i]]), float(scores[i])) 
-                   for i in range(len(cand_idxs))]
-        
-        sorted_results = sorted(results, key=lambda x: x[1], reverse=True)
-        logger.debug(f"Top 3 scores: {sorted_results[:3]}")
-        return sorted_results
+        cand_idx_t = candidates_to_device(cand_idxs, device, self._pinned, len(self.idx2speaker_id))
+        logger.debug("Created candidate tensor with shape: %s", cand_idx_t.shape)
+        
+        # Calculate scores: bias + (V @ q) / scale over the precomputed item vectors
+        q = query_vector.to(self._V_all.dtype)
+        if self._compiled_score_fn is not None:
+            scores = self._compiled_score_fn(self._V_all, self._bias_all, cand_idx_t, q, 1.0 / self.model._scale).float()
+        else:
+            V = self._V_all.index_select(0, cand_idx_t)
+            bias = self._bias_all.index_select(0, cand_idx_t)
+            scores = torch.addmv(bias, V, q, alpha=1.0 / self.model._scale).float()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Score statistics - min: %.4f, max: %.4f, mean: %.4f", scores.min().item(), scores.max().item(), scores.mean().item())
+        
+        # Partial sort on device; only the top K cross over to Python
+        top_scores, top_pos = torch.topk(scores, k=min(limit, scores.numel()))
+        top_speaker_ids = self.idx2speaker_id[cand_idxs[top_pos.cpu().numpy()]]
+        results = [(int(speaker_id), score)
+                   for speaker_id, score in zip(top_speaker_ids.tolist(), top_scores.tolist())]
+        
+        logger.debug("Top 3 scores: %s", results[:3])
+        return results
+    
+    def invalidate_speakers_with_sermons(self) -> None:
+        """Drop the cached speakers-with-sermons set so the next request re-queries it."""
+        self._speakers_with_sermons_cache = None
+    
+    def _get_speakers_with_sermons(self, db: Session) -> FrozenSet[int]:
+        """Ids of speakers that have sermons, cached for SPEAKERS_WITH_SERMONS_TTL seconds."""
+        now = time.monotonic()
+        if self._speakers_with_sermons_cache is not None:
+            cached_at, speaker_ids = self._speakers_with_sermons_cache
+            if now - cached_at < SPEAKERS_WITH_SERMONS_TTL:
+                return speaker_ids
+        
+        speakers_with_sermons_query = db.query(models.Speaker.id).filter(models.Speaker.has_sermons.is_(True))
+        speaker_ids = frozenset(speaker_id for (speaker_id,) in speakers_with_sermons_query)
+        logger.info("Found %s speakers with sermons in database", len(speaker_ids))
+        self._speakers_with_sermons_cache = (now, speaker_ids)
+        return speaker_ids
     
     def _get_fallback_recommendations(self, limit: int, db: Session = None) -> List[Tuple[int, float]]:
         """Generate fallback recommendations when ML model is not available."""
-        logger.info(f"Generating fallback recommendations with limit: {limit}")
+        logger.info("Generating fallback recommendations with limit: %s", limit)
         
         if db:
             # Get speakers with sermons for realistic fallback
             from app.db import models
-            speakers_with_sermons = db.query(models.Speaker.id).join(models.Sermon).filter(
-                models.Speaker.is_recommended == True
-            ).distinct().limit(limit).all()
+            speakers_with_sermons = db.query(models.Speaker.id).filter(
+                models.Speaker.is_recommended == True,
+                models.Speaker.has_sermons.is_(True)
+            ).limit(limit).all()
             
-            logger.debug(f"Found {len(speakers_with_sermons)} recommended speakers with sermons")
+            logger.debug("Found %s recommended speakers with sermons", len(speakers_with_sermons))
             
-            fallback_recs = []
-            for i, speaker in enumerate(speakers_with_sermons):
-                # Assign decreasing scores
-                score = 0.95 - (i * 0.05)
-                fallback_recs.append((speaker.id, max(score, 0.5)))
+            # Assign decreasing scores, floored at 0.5
+            speaker_ids = [speaker.id for speaker in speakers_with_sermons]
+            scores = np.maximum(0.95 - 0.05 * np.arange(len(speaker_ids)), 0.5)
+            fallback_recs = list(zip(speaker_ids, scores.tolist()))
             
-            logger.info(f"Generated {len(fallback_recs)} fallback recommendations with sermons")
+            logger.info("Generated %s fallback recommendations with sermons", len(fallback_recs))
             return fallback_recs
         else:
             # Return mock recommendations - in production, you might want to use simple heuristics
@@ -326,7 +458,7 @@ class MLRecommendationService:
                 (1, 0.95), (2, 0.92), (3, 0.89), (4, 0.87), (5, 0.85),
                 (6, 0.83), (7, 0.81), (8, 0.79), (9, 0.77), (10, 0.75)
             ]
-            logger.info(f"Using mock recommendations (limit: {limit})")
+            logger.info("Using mock recommendations (limit: %s)", limit)
             return mock_recommendations[:limit]
     
     def store_recommendations(
@@ -348,56 +480,78 @@ class MLRecommendationService:
         speaker_ids = [int(rec[0]) for rec in speaker_recommendations]
         scores = [float(rec[1]) for rec in speaker_recommendations]
         
-        # Check if recommendations already exist for this user
-        existing = db.query(models.Recommendations).filter(
-            models.Recommendations.user_id == user_id
-        ).first()
-        
-        if existing:
-            # Update existing recommendations
-            existing.speaker_ids = speaker_ids
-            existing.scores = scores
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            # Create new recommendations
-            new_recommendations = models.Recommendations(
-                user_id=user_id,
-                speaker_ids=speaker_ids,
-                scores=scores
-            )
-            db.add(new_recommendations)
-            db.commit()
-            db.refresh(new_recommendations)
-            return new_recommendations
+        # Insert or overwrite in one round trip, returning the stored row
+        stmt = pg_insert(models.Recommendations).values(
+            user_id=user_id,
+            speaker_ids=speaker_ids,
+            scores=scores
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_user_recommendations',
+            set_={
+                'speaker_ids': stmt.excluded.speaker_ids,
+                'scores': stmt.excluded.scores,
+                'updated_at': func.now()  # onupdate doesn't fire for ON CONFLICT
+            }
+        ).returning(models.Recommendations)
+        
+        stored = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+        db.commit()
+        return stored
     
     def get_stored_recommendations(
         self, 
         db: Session, 
-        user_id: int
-    ) -> Optional[models.Recommendations]:
-        """Retrieve stored recommendations for a user.
+        user_id: int,
+        limit: int = 10
+    ):
+        """Retrieve the top stored recommendations for a user.
+        
+        Only the first `limit` speaker_ids/scores are read; the packed arrays are
+        sliced in Postgres rather than shipped whole and sliced in Python.
         
         Args:
             db: Database session
             user_id: User ID
+            limit: Number of leading speaker_ids/scores to return
             
         Returns:
-            Recommendations object or None if not found
+            Row with speaker_ids and scores numpy arrays, or None if not found
         """
-        return db.query(models.Recommendations).filter(
+        def head(column):
+            # 4 bytes per int32 id / float32 score
+            return func.substring(column, 1, 4 * max(limit, 0), type_=column.type)
+        
+        return db.query(
+            head(models.Recommendations.speaker_ids).label('speaker_ids'),
+            head(models.Recommendations.scores).label('scores')
+        ).filter(
             models.Recommendations.user_id == user_id
         ).first()
 
 
-# Global service instance
-ml_service = MLRecommendationService()
+# Global service instance, created on first use so importing this module stays cheap
+_ml_service: Optional[MLRecommendationService] = None
+_ml_service_lock = threading.Lock()
+
+
+@event.listens_for(models.Sermon, "after_insert")
+@event.listens_for(models.Sermon, "after_update")
+@event.listens_for(models.Sermon, "after_delete")
+def _sermon_changed(mapper, connection, target):
+    # Sermon writes can change which speakers have sermons; don't wait out the TTL
+    if _ml_service is not None:
+        _ml_service.invalidate_speakers_with_sermons()
 
 
 def get_ml_service() -> MLRecommendationService:
-    """Get the global ML recommendation service instance."""
-    return ml_service
+    """Get the global ML recommendation service instance, loading the model on first call."""
+    global _ml_service
+    if _ml_service is None:
+        with _ml_service_lock:
+            if _ml_service is None:
+                _ml_service = MLRecommendationService()
+    return _ml_service
 
 
 def trigger_recommendation_update(user_id: int, db: Session) -> bool:
@@ -412,39 +566,42 @@ def trigger_recommendation_update(user_id: int, db: Session) -> bool:
     Returns:
         bool: True if recommendations were successfully updated, False otherwise
     """
-    logger.info(f"Triggering recommendation update for user {user_id}")
+    logger.info("Triggering recommendation update for user %s", user_id)
     
     try:
         # Get the user
         user = db.query(models.User).filter(models.User.id == user_id).first()
         if not user:
-            logger.warning(f"User {user_id} not found for recommendation update")
+            logger.warning("User %s not found for recommendation update", user_id)
             return False
         
-        logger.debug(f"Found user: {user.email if hasattr(user, 'email') else 'unknown'}")
+        logger.debug("Found user: %s", user.email if hasattr(user, 'email') else 'unknown')
         
-        # Get user's sermon preferences to build user_swipes data
-        sermon_preferences = db.query(models.UserSermonPreference).filter(
+        # Get user's sermon preferences with each sermon's speaker in one JOIN, columns only
+        sermon_preferences = db.query(
+            models.Sermon.id,
+            models.Sermon.speaker_id,
+            models.UserSermonPreference.preference
+        ).join(
+            models.UserSermonPreference, models.UserSermonPreference.sermon_id == models.Sermon.id
+        ).filter(
             models.UserSermonPreference.user_id == user_id
         ).all()
         
-        logger.debug(f"Found {len(sermon_preferences)} sermon preferences for user {user_id}")
+        logger.debug("Found %s sermon preferences for user %s", len(sermon_preferences), user_id)
         
         # Convert sermon preferences to swipes format for ML model
-        user_swipes = []
-        for pref in sermon_preferences:
-            # Get the sermon to access speaker_id
-            sermon = db.query(models.Sermon).filter(models.Sermon.id == pref.sermon_id).first()
-            if sermon:
-                # Convert thumbs_up/thumbs_down to numerical rating
-                rating = 5.0 if pref.preference == 'thumbs_up' else 2.0
-                user_swipes.append({
-                    'speaker_id': sermon.speaker_id,
-                    'rating': rating,
-                    'sermon_id': pref.sermon_id
-                })
-        
-        logger.info(f"Updating recommendations for user {user_id} based on {len(user_swipes)} sermon preferences")
+        # (thumbs_up/thumbs_down become numerical ratings)
+        user_swipes = [
+            {
+                'speaker_id': row.speaker_id,
+                'rating': 5.0 if row.preference == 'thumbs_up' else 2.0,
+                'sermon_id': row.id
+            }
+            for row in sermon_preferences
+        ]
+        
+        logger.info("Updating recommendations for user %s based on %s sermon preferences", user_id, len(user_swipes))
         
         # Build user preferences from profile
         user_preferences = {
@@ -455,24 +612,10 @@ def trigger_recommendation_update(user_id: int, db: Session) -> bool:
             'gender_preference': user.gender_preference
         }
         
-        logger.debug(f"User preferences: {user_preferences}")
-
-        JSON_INPUT = {
-            "trait_choices": [
-                "Gender::Female pastor",
-                "Preaching method::Topical",
-                "Theological tradition::Mixed",
-                "Women in leadership::Egalitarian",
-            ],
-            "swipes": [
-                {"pastorName": "AndyStanley,", "pastorId": 44, "rating": 5},
-                {"pastorName": "RickWarren", "pastorId": 45, "rating": 4},
-                {"pastorName": "JohnPiper", "pastorId": 48, "rating": 2},
-            ],
-        }
+        logger.debug("User preferences: %s", user_preferences)
 
-        user_preferences = {"trait_choices": JSON_INPUT.get("trait_choices", [])}
-        user_swipes = [{"speaker_id": s.get("pastorId"), "rating": float(s.get("rating", 0))} for s in JSON_INPUT.get("swipes", [])]
+        _ensure_model_path()
+        from model.inference_service import get_model_service
         ml_service = get_model_service()
         speaker_recs = ml_service.generate_recommendations(
             user_preferences=user_preferences,
@@ -483,12 +626,12 @@ def trigger_recommendation_update(user_id: int, db: Session) -> bool:
         # Store the updated recommendations
         if speaker_recs:
             stored_recs = ml_service.store_recommendations(db, user_id, speaker_recs)
-            logger.info(f"Successfully updated recommendations for user {user_id} - stored {len(speaker_recs)} recommendations")
+            logger.info("Successfully updated recommendations for user %s - stored %s recommendations", user_id, len(speaker_recs))
             return True
         else:
-            logger.warning(f"No recommendations generated for user {user_id}")
+            logger.warning("No recommendations generated for user %s", user_id)
             return False
             
     except Exception as e:
-        logger.error(f"Error updating recommendations for user {user_id}: {e}", exc_info=True)
+        logger.error("Error updating recommendations for user %s: %s", user_id, e, exc_info=True)
         return False
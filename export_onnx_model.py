@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Export the sentence transformer used for recommendations to an int8-quantized ONNX model.
+Run once at build time; AIEmbeddingService picks up ai_cache/onnx automatically on CPU.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Must match ONNX_MODEL_FILE in app/services/ai_embedding_service.py
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def export_onnx_model(model_name: str = DEFAULT_MODEL_NAME) -> bool:
+    """Export model_name to ONNX and quantize it for AVX-512 VNNI CPUs"""
+    try:
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+    except ImportError:
+        print("❌ ONNX export needs sentence-transformers[onnx]. Install with: pip install 'sentence-transformers[onnx]'")
+        return False
+
+    onnx_dir = project_root / "ai_cache" / "onnx"
+    print(f"🚀 Exporting '{model_name}' to {onnx_dir}...")
+
+    try:
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save_pretrained(str(onnx_dir))
+        export_dynamic_quantized_onnx_model(model, "avx512_vnni", str(onnx_dir))
+    except Exception as e:
+        print(f"❌ Error exporting ONNX model: {e}")
+        return False
+
+    if not (onnx_dir / ONNX_MODEL_FILE).exists():
+        print(f"❌ Expected quantized model at {onnx_dir / ONNX_MODEL_FILE}")
+        return False
+
+    print(f"✅ Quantized ONNX model saved to {onnx_dir / ONNX_MODEL_FILE}")
+    return True
+
+
+if __name__ == "__main__":
+    success = export_onnx_model(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL_NAME)
+    sys.exit(0 if success else 1)
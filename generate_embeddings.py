@@ -4,36 +4,53 @@ Generate AI embeddings for all speakers in the database.
 This script should be run once to initialize the embedding cache.
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
+from typing import Optional
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.services.ai_embedding_service import get_ai_service
 
-
-def generate_embeddings():
-    """Generate and cache AI embeddings for all speakers"""
+def generate_embeddings(batch_size: Optional[int] = None):
+    """Generate and cache AI embeddings for all speakers
+    
+    Args:
+        batch_size: Texts per forward pass; defaults to the service's ENCODE_BATCH_SIZE.
+            Raise it on GPUs with spare memory
+    """
     print("🚀 Starting AI embedding generation...")
     
-    # Get database session
+    # Imported here so a bad database config fails (and --help returns) before torch and
+    # sentence-transformers spend seconds loading
+    from sqlalchemy import text
+    from app.db.database import get_db
+    
+    # Get database session and make sure it can connect
     db = next(get_db())
+    try:
+        db.execute(text("SELECT 1"))
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        db.close()
+        return False
+    
+    from app.services.ai_embedding_service import get_ai_service, ENCODE_BATCH_SIZE
     
     # Get AI service
     ai_service = get_ai_service()
     
     if not ai_service.is_available():
         print("❌ AI service not available. Make sure sentence-transformers is installed.")
+        db.close()
         return False
     
     try:
         # Generate embeddings for all speakers
-        embeddings = ai_service.generate_speaker_embeddings(db)
+        embeddings = ai_service.generate_speaker_embeddings(db, batch_size=batch_size or ENCODE_BATCH_SIZE)
         
         if embeddings:
             print(f"✅ Successfully generated {len(embeddings)} speaker embeddings")
@@ -51,5 +68,9 @@ def generate_embeddings():
 
 
 if __name__ == "__main__":
-    success = generate_embeddings()
+    parser = argparse.ArgumentParser(description="Generate and cache AI embeddings for all speakers.")
+    parser.add_argument("--batch-size", type=int, default=None, help="texts per forward pass (default: ENCODE_BATCH_SIZE in ai_embedding_service)")
+    args = parser.parse_args()
+    
+    success = generate_embeddings(batch_size=args.batch_size)
     sys.exit(0 if success else 1)
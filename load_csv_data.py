@@ -17,14 +17,19 @@ The script uses the FastAPI app's database configuration. Set your database URL
 3. Update app/core/config.py directly (not recommended for production)
 """
 
-import csv
-import json
+import gzip
+import hashlib
+import io
+import orjson
 import sys
 import os
+from collections import Counter
 from typing import Dict, List, Optional
+import pandas as pd
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import Enum as SQLEnum, Integer, String, text
 
 # Add the app directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -33,13 +38,22 @@ from app.db.database import SessionLocal, engine
 from app.db.models import Church, Speaker
 from app.models.schemas import TeachingStyle, BibleApproach, EnvironmentStyle, Gender, SpeakingTopic, TopicCategory
 
+# value -> member maps, so parsing a cell is a dict lookup rather than EnumClass(value) and a ValueError on a miss
+_ENUM_MAPS = {
+    enum_class: {member.value: member for member in enum_class}
+    for enum_class in (TeachingStyle, BibleApproach, EnvironmentStyle, Gender, TopicCategory)
+}
+
+# Parses and validates a whole speaking_topics cell in pydantic-core, without the json module
+_TOPICS_ADAPTER = TypeAdapter(List[SpeakingTopic])
+
 def parse_json_field(json_str: str) -> Optional[dict]:
     """Parse JSON string field, return None if empty or invalid."""
     if not json_str or json_str.strip() == "":
         return None
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
         print(f"Warning: Could not parse JSON field: {json_str}")
         return None
 
@@ -47,19 +61,25 @@ def parse_enum_field(enum_class, value: str) -> Optional[object]:
     """Parse enum field, return None if empty or invalid."""
     if not value or value.strip() == "":
         return None
-    try:
-        return enum_class(value)
-    except ValueError:
+    member = _ENUM_MAPS[enum_class].get(value)
+    if member is None:
         print(f"Warning: Invalid enum value '{value}' for {enum_class.__name__}")
-        return None
+    return member
 
-def parse_speaking_topics(json_str: str) -> List[SpeakingTopic]:
-    """Parse speaking topics from JSON string, return empty list if empty or invalid."""
+def parse_speaking_topics(json_str: str) -> List[dict]:
+    """Parse speaking topics from JSON string into SpeakingTopic-shaped dicts, return empty list if empty or invalid."""
     if not json_str or json_str.strip() == "":
         return []
     
+    # Fast path for well-formed cells; anything invalid falls through to the
+    # per-topic loop below, which warns and repairs what it can
+    try:
+        return _TOPICS_ADAPTER.dump_python(_TOPICS_ADAPTER.validate_json(json_str), mode='json')
+    except ValidationError:
+        pass
+    
     try:
-        topics_data = json.loads(json_str)
+        topics_data = orjson.loads(json_str)
         if not isinstance(topics_data, list):
             print(f"Warning: speaking_topics should be a list, got {type(topics_data)}")
             return []
@@ -73,110 +93,225 @@ def parse_speaking_topics(json_str: str) -> List[SpeakingTopic]:
                     description = topic_data.get('description')
                     category_str = topic_data.get('category', 'OTHER')
                     
-                    try:
-                        category = TopicCategory(category_str)
-                        speaking_topics.append(SpeakingTopic(
-                            name=name,
-                            description=description,
-                            category=category
-                        ))
-                    except ValueError:
+                    category = _ENUM_MAPS[TopicCategory].get(category_str) if isinstance(category_str, str) else None
+                    if category is None:
                         print(f"Warning: Invalid topic category '{category_str}', using OTHER")
-                        speaking_topics.append(SpeakingTopic(
-                            name=name,
-                            description=description,
-                            category=TopicCategory.OTHER
-                        ))
+                        category = TopicCategory.OTHER
+                    # Stored in a JSON column, so build the serialized shape directly rather than
+                    # validating a SpeakingTopic model per topic
+                    speaking_topics.append({
+                        "name": name,
+                        "description": description,
+                        "category": category.value
+                    })
                 else:
                     print(f"Warning: Invalid topic data format: {topic_data}")
             else:
                 print(f"Warning: Topic data should be a dict, got {type(topic_data)}")
         
         return speaking_topics
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print(f"Warning: Could not parse speaking_topics JSON: {json_str}")
         return []
 
+# Columns each loader reads, with the value used when the CSV doesn't have the column at all
+CHURCH_COLUMNS = {
+    'name': '', 'denomination': '', 'description': '', 'address': '', 'phone': '', 'email': '',
+    'website': '', 'founded_year': '', 'membership_count': '', 'service_times': '', 'social_media': '',
+    'is_active': 'true', 'sort_order': '',
+}
+SPEAKER_COLUMNS = {
+    'name': '', 'title': '', 'bio': '', 'email': '', 'phone': '', 'years_of_service': '',
+    'social_media': '', 'speaking_topics': '', 'sort_order': '', 'teaching_style': '',
+    'bible_approach': '', 'environment_style': '', 'gender': '', 'is_recommended': 'false',
+    'church_name': '',
+}
+
+# Read buffer for uncompressed CSVs; far fewer read() syscalls than the 8 KiB default on multi-MB files
+CSV_READ_BUFFER = 1 << 20
+
+# Range of a Postgres integer column; anything outside fails the whole statement
+INT4_MIN, INT4_MAX = -2**31, 2**31 - 1
+
+def print_status_counts(kind: str, statuses: Counter):
+    """Print one summary line of created/updated/unchanged counts instead of a line per row."""
+    print(f"  {kind}: " + ", ".join(f"{statuses[status]} {status}" for status in ('created', 'updated', 'unchanged')))
+
+def open_csv(path: str):
+    """Open a CSV for binary reading, transparently decompressing .csv.gz files."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb', buffering=CSV_READ_BUFFER)
+
+def find_csv(path: str) -> Optional[str]:
+    """path if it exists, else path + '.gz' if that exists, else None."""
+    for candidate in (path, path + '.gz'):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+def read_csv_frame(csv_file: str, columns: Dict[str, str]) -> pd.DataFrame:
+    """Read csv_file as strings (blank cells stay ''), adding any missing columns with their defaults."""
+    with open_csv(csv_file) as file:
+        df = pd.read_csv(file, dtype=str, keep_default_na=False, encoding='utf-8', engine='c')
+    for column, default in columns.items():
+        if column not in df.columns:
+            df[column] = default
+    return df
+
+def parse_int_column(values: pd.Series, default: Optional[int] = None) -> pd.Series:
+    """Parse a whole integer column at once; blank or malformed cells become default."""
+    if values.dtype == object:
+        # Only plain digit cells are parsed; '12.5' or '1e3' would otherwise come back as floats
+        # and make the Int64 cast raise, so they count as malformed along with everything else
+        values = values.where(values.astype(str).str.fullmatch(r'\s*[-+]?\d+\s*'))
+    parsed = pd.to_numeric(values, errors='coerce').astype('Int64')
+    # object dtype so to_dict() yields plain ints and None rather than numpy ints and pd.NA
+    return parsed.astype(object).where(parsed.notna(), default)
+
+def blank_to_none(values: pd.Series) -> pd.Series:
+    """Turn blank cells of an optional text column into None."""
+    return values.where(values != '', None)
+
+def parse_bool_column(values: pd.Series) -> pd.Series:
+    """Parse a whole 'true'/'false' column at once."""
+    return values.str.strip().str.lower().eq('true')
+
+def to_json_text(values: pd.Series) -> pd.Series:
+    """Serialize a parsed JSON column back to text for COPY; None stays NULL."""
+    return values.map(lambda value: None if value is None else orjson.dumps(value).decode())
+
+def to_enum_label(values: pd.Series) -> pd.Series:
+    """Enum members as the labels of their Postgres enum type; None stays NULL."""
+    return values.map(lambda member: None if member is None else member.name)
+
+def drop_invalid_rows(df: pd.DataFrame, model, kind: str) -> pd.DataFrame:
+    """Drop rows Postgres would reject, since one bad row would otherwise abort the whole upsert.
+    
+    Checks every column of model's table that df has: strings longer than the column allows
+    and integers outside its range. Each dropped row is reported with its CSV line number.
+    """
+    invalid = pd.Series(False, index=df.index)
+    for column in model.__table__.columns:
+        if column.name not in df.columns:
+            continue
+        values = df[column.name]
+        if isinstance(column.type, String) and not isinstance(column.type, SQLEnum) and column.type.length:
+            bad = values.map(lambda value, length=column.type.length: isinstance(value, str) and len(value) > length)
+            reason = f"longer than {column.type.length} characters"
+        elif isinstance(column.type, Integer):
+            numbers = pd.to_numeric(values)
+            bad = numbers.notna() & ~numbers.between(INT4_MIN, INT4_MAX)
+            reason = "out of integer range"
+        else:
+            continue
+        for row_index in df.index[bad & ~invalid]:
+            print(f"Error processing {kind} row {row_index + 2}: {column.name} is {reason}, skipping")
+        invalid |= bad
+    
+    if invalid.any():
+        print(f"Skipped {int(invalid.sum())} invalid {kind} rows")
+    return df[~invalid]
+
+def add_content_hash(frame: pd.DataFrame) -> pd.DataFrame:
+    """frame plus a content_hash column fingerprinting every other value in each row."""
+    hashes = [
+        # Bool columns come through as numpy scalars, hence OPT_SERIALIZE_NUMPY
+        hashlib.blake2b(orjson.dumps(values, option=orjson.OPT_SERIALIZE_NUMPY), digest_size=16).hexdigest()
+        for values in frame.itertuples(index=False, name=None)
+    ]
+    return frame.assign(content_hash=hashes)
+
+def copy_to_stage(db: Session, table: str, frame: pd.DataFrame, text_columns: List[str]) -> str:
+    """COPY frame into a temp table with table's column types and return the temp table's name.
+    
+    Empty cells load as NULL except in text_columns, where they stay ''.
+    """
+    stage = f"{table}_stage"
+    column_list = ", ".join(frame.columns)
+    # Column types only, so the id sequence and NOT NULL constraints don't apply to staged rows
+    db.execute(text(f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA"))
+    
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    cursor.copy_expert(
+        f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(text_columns)}))",
+        buffer
+    )
+    return stage
+
+def upsert_from_stage(db: Session, table: str, stage: str, columns: List[str], returning: List[str]):
+    """Update rows of table whose name is staged and insert the rest, in a single statement.
+    
+    Rows whose content_hash matches the staged one are left untouched, so re-loading an
+    unchanged file writes nothing. Returns (status, *returning) rows where status is
+    'created', 'updated' or 'unchanged'. There is no unique constraint on name, so this
+    matches on name rather than using ON CONFLICT.
+    """
+    column_list = ", ".join(columns)
+    returning_list = ", ".join(returning)
+    target_returning_list = ", ".join(f"t.{column}" for column in returning)
+    assignments = ", ".join(f"{column} = s.{column}" for column in columns if column != 'name')
+    return db.execute(text(f"""
+        WITH updated AS (
+            UPDATE {table} AS t SET {assignments}, updated_at = now()
+            FROM {stage} AS s
+            WHERE t.name = s.name AND t.content_hash IS DISTINCT FROM s.content_hash
+            RETURNING {target_returning_list}
+        ), inserted AS (
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {stage} AS s
+            WHERE NOT EXISTS (SELECT 1 FROM {table} AS t WHERE t.name = s.name)
+            RETURNING {returning_list}
+        ), unchanged AS (
+            SELECT {target_returning_list}
+            FROM {table} AS t JOIN {stage} AS s ON t.name = s.name
+            WHERE t.content_hash = s.content_hash
+        )
+        SELECT 'updated' AS status, {returning_list} FROM updated
+        UNION ALL
+        SELECT 'created' AS status, {returning_list} FROM inserted
+        UNION ALL
+        SELECT 'unchanged' AS status, {returning_list} FROM unchanged
+    """)).all()
+
 def load_churches_safe(db: Session, csv_file: str) -> Dict[str, int]:
     """Load churches from CSV, updating existing or creating new ones."""
-    church_name_to_id = {}
-    
     print("Loading churches (safe mode - updating existing)...")
     
-    with open(csv_file, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        
-        for row_num, row in enumerate(reader, start=2):
-            try:
-                # Parse JSON fields
-                address = parse_json_field(row.get('address', ''))
-                service_times = parse_json_field(row.get('service_times', ''))
-                social_media = parse_json_field(row.get('social_media', ''))
-                
-                # Parse integer fields
-                founded_year = int(row['founded_year']) if row.get('founded_year') else None
-                membership_count = int(row['membership_count']) if row.get('membership_count') else None
-                sort_order = int(row['sort_order']) if row.get('sort_order') else 0
-                
-                # Parse boolean field
-                is_active = row.get('is_active', 'true').lower() == 'true'
-                
-                # Check if church already exists
-                existing_church = db.query(Church).filter(Church.name == row['name']).first()
-                
-                if existing_church:
-                    # Update existing church
-                    existing_church.denomination = row['denomination']
-                    existing_church.description = row.get('description', '')
-                    existing_church.address = address
-                    existing_church.phone = row.get('phone', '') or None
-                    existing_church.email = row.get('email', '') or None
-                    existing_church.website = row.get('website', '') or None
-                    existing_church.founded_year = founded_year
-                    existing_church.membership_count = membership_count
-                    existing_church.service_times = service_times
-                    existing_church.social_media = social_media
-                    existing_church.is_active = is_active
-                    existing_church.sort_order = sort_order
-                    
-                    church_id = existing_church.id
-                    church_name = existing_church.name
-                    print(f"  Updated church: {church_name} (ID: {church_id})")
-                else:
-                    # Create new church
-                    church = Church(
-                        name=row['name'],
-                        denomination=row['denomination'],
-                        description=row.get('description', ''),
-                        address=address,
-                        phone=row.get('phone', '') or None,
-                        email=row.get('email', '') or None,
-                        website=row.get('website', '') or None,
-                        founded_year=founded_year,
-                        membership_count=membership_count,
-                        service_times=service_times,
-                        social_media=social_media,
-                        is_active=is_active,
-                        sort_order=sort_order
-                    )
-                    
-                    db.add(church)
-                    db.flush()  # Flush to get the ID
-                    church_id = church.id
-                    church_name = church.name
-                    print(f"  Created church: {church_name} (ID: {church_id})")
-                
-                church_name_to_id[church_name] = church_id
-                
-            except Exception as e:
-                print(f"Error loading church at row {row_num}: {e}")
-                print(f"Row data: {row}")
-                continue
+    # Parse whole columns up front rather than cell by cell
+    df = read_csv_frame(csv_file, CHURCH_COLUMNS)
+    # JSON cells are validated, then re-serialized compactly for COPY
+    for column in ('address', 'service_times', 'social_media'):
+        df[column] = to_json_text(df[column].map(parse_json_field))
+    df['founded_year'] = parse_int_column(df['founded_year'])
+    df['membership_count'] = parse_int_column(df['membership_count'])
+    df['sort_order'] = parse_int_column(df['sort_order'], default=0)
+    df['is_active'] = parse_bool_column(df['is_active'])
+    for column in ('phone', 'email', 'website'):
+        df[column] = blank_to_none(df[column])
     
+    # A repeated name later in the file replaces the earlier row
+    df = df.drop_duplicates('name', keep='last')
+    df = drop_invalid_rows(df, Church, 'church')
+    
+    # Stream the whole file into Postgres with COPY and upsert it from there in one statement,
+    # instead of sending each church through the ORM
     try:
+        churches = add_content_hash(df[list(CHURCH_COLUMNS)])
+        stage = copy_to_stage(db, 'churches', churches, text_columns=['name', 'denomination', 'description'])
+        church_name_to_id = {}
+        statuses = Counter()
+        for status, church_id, church_name in upsert_from_stage(db, 'churches', stage, list(churches.columns), returning=["id", "name"]):
+            church_name_to_id[church_name] = church_id
+            statuses[status] += 1
+        
         db.commit()
+        print_status_counts("Churches", statuses)
         print(f"Successfully processed {len(church_name_to_id)} churches")
-    except IntegrityError as e:
+    except SQLAlchemyError as e:
         db.rollback()
         print(f"Error committing churches: {e}")
         return {}
@@ -185,94 +320,47 @@ def load_churches_safe(db: Session, csv_file: str) -> Dict[str, int]:
 
 def load_speakers_safe(db: Session, csv_file: str, church_name_to_id: Dict[str, int]) -> int:
     """Load speakers from CSV, updating existing or creating new ones."""
-    speakers_processed = 0
-    
     print("Loading speakers (safe mode - updating existing)...")
     
-    with open(csv_file, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        
-        for row_num, row in enumerate(reader, start=2):
-            try:
-                # Parse JSON fields
-                social_media = parse_json_field(row.get('social_media', ''))
-                speaking_topics = parse_speaking_topics(row.get('speaking_topics', ''))
-                
-                # Parse enum fields
-                teaching_style = parse_enum_field(TeachingStyle, row.get('teaching_style', ''))
-                bible_approach = parse_enum_field(BibleApproach, row.get('bible_approach', ''))
-                environment_style = parse_enum_field(EnvironmentStyle, row.get('environment_style', ''))
-                gender = parse_enum_field(Gender, row.get('gender', ''))
-                
-                # Parse integer fields
-                years_of_service = int(row['years_of_service']) if row.get('years_of_service') else None
-                sort_order = int(row['sort_order']) if row.get('sort_order') else 0
-                
-                # Parse boolean field
-                is_recommended = row.get('is_recommended', 'false').lower() == 'true'
-                
-                # Get church_id from church_name
-                church_name = row.get('church_name', '')
-                church_id = church_name_to_id.get(church_name)
-                
-                if not church_id and church_name:
-                    print(f"Warning: Church '{church_name}' not found for speaker '{row['name']}'")
-                
-                # Check if speaker already exists
-                existing_speaker = db.query(Speaker).filter(Speaker.name == row['name']).first()
-                
-                if existing_speaker:
-                    # Update existing speaker
-                    existing_speaker.title = row.get('title', '')
-                    existing_speaker.bio = row.get('bio', '') or None
-                    existing_speaker.email = row.get('email', '') or None
-                    existing_speaker.phone = row.get('phone', '') or None
-                    existing_speaker.years_of_service = years_of_service
-                    existing_speaker.social_media = social_media
-                    existing_speaker.speaking_topics = speaking_topics
-                    existing_speaker.sort_order = sort_order
-                    existing_speaker.teaching_style = teaching_style or TeachingStyle.WARM_AND_CONVERSATIONAL
-                    existing_speaker.bible_approach = bible_approach or BibleApproach.BALANCED
-                    existing_speaker.environment_style = environment_style or EnvironmentStyle.BLENDED
-                    existing_speaker.gender = gender
-                    existing_speaker.is_recommended = is_recommended
-                    existing_speaker.church_id = church_id
-                    
-                    print(f"  Updated speaker: {existing_speaker.name} (Church ID: {church_id})")
-                else:
-                    # Create new speaker
-                    speaker = Speaker(
-                        name=row['name'],
-                        title=row.get('title', ''),
-                        bio=row.get('bio', '') or None,
-                        email=row.get('email', '') or None,
-                        phone=row.get('phone', '') or None,
-                        years_of_service=years_of_service,
-                        social_media=social_media,
-                        speaking_topics=speaking_topics,
-                        sort_order=sort_order,
-                        teaching_style=teaching_style or TeachingStyle.WARM_AND_CONVERSATIONAL,
-                        bible_approach=bible_approach or BibleApproach.BALANCED,
-                        environment_style=environment_style or EnvironmentStyle.BLENDED,
-                        gender=gender,
-                        is_recommended=is_recommended,
-                        church_id=church_id
-                    )
-                    
-                    db.add(speaker)
-                    print(f"  Created speaker: {speaker.name} (Church ID: {church_id})")
-                
-                speakers_processed += 1
-                
-            except Exception as e:
-                print(f"Error loading speaker at row {row_num}: {e}")
-                print(f"Row data: {row}")
-                continue
+    # Parse whole columns up front rather than cell by cell
+    df = read_csv_frame(csv_file, SPEAKER_COLUMNS)
+    # JSON cells are validated, then re-serialized compactly for COPY
+    df['social_media'] = to_json_text(df['social_media'].map(parse_json_field))
+    df['speaking_topics'] = to_json_text(df['speaking_topics'].map(parse_speaking_topics))
+    df['teaching_style'] = df['teaching_style'].map(lambda value: parse_enum_field(TeachingStyle, value) or TeachingStyle.WARM_AND_CONVERSATIONAL)
+    df['bible_approach'] = df['bible_approach'].map(lambda value: parse_enum_field(BibleApproach, value) or BibleApproach.BALANCED)
+    df['environment_style'] = df['environment_style'].map(lambda value: parse_enum_field(EnvironmentStyle, value) or EnvironmentStyle.BLENDED)
+    df['gender'] = df['gender'].map(lambda value: parse_enum_field(Gender, value))
+    for column in ('teaching_style', 'bible_approach', 'environment_style', 'gender'):
+        df[column] = to_enum_label(df[column])
+    df['years_of_service'] = parse_int_column(df['years_of_service'])
+    df['sort_order'] = parse_int_column(df['sort_order'], default=0)
+    df['is_recommended'] = parse_bool_column(df['is_recommended'])
+    for column in ('bio', 'email', 'phone'):
+        df[column] = blank_to_none(df[column])
+    
+    # A repeated name later in the file replaces the earlier row
+    df = df.drop_duplicates('name', keep='last')
     
+    # Get church_id from church_name
+    df['church_id'] = parse_int_column(df['church_name'].map(church_name_to_id.get))
+    for speaker_name, church_name in df.loc[df['church_id'].isna() & df['church_name'].ne(''), ['name', 'church_name']].itertuples(index=False):
+        print(f"Warning: Church '{church_name}' not found for speaker '{speaker_name}'")
+    
+    # Stream the whole file into Postgres with COPY and upsert it from there in one statement,
+    # instead of sending each speaker through the ORM
+    columns = [column for column in SPEAKER_COLUMNS if column != 'church_name'] + ['church_id']
     try:
+        speakers = add_content_hash(drop_invalid_rows(df[columns], Speaker, 'speaker'))
+        stage = copy_to_stage(db, 'speakers', speakers, text_columns=['name', 'title'])
+        results = upsert_from_stage(db, 'speakers', stage, list(speakers.columns), returning=["id"])
+        statuses = Counter(status for status, speaker_id in results)
+        speakers_processed = len(results)
+        
         db.commit()
+        print_status_counts("Speakers", statuses)
         print(f"Successfully processed {speakers_processed} speakers")
-    except IntegrityError as e:
+    except SQLAlchemyError as e:
         db.rollback()
         print(f"Error committing speakers: {e}")
         return 0
@@ -281,17 +369,17 @@ def load_speakers_safe(db: Session, csv_file: str, church_name_to_id: Dict[str,
 
 def main():
     """Main function to safely load CSV data into database."""
-    # File paths
-    churches_csv = "churches_with_denominations.csv"
-    speakers_csv = "speakers.csv"
+    # File paths (either may be shipped gzipped)
+    churches_csv = find_csv("churches_with_denominations.csv")
+    speakers_csv = find_csv("speakers.csv")
     
     # Check if files exist
-    if not os.path.exists(churches_csv):
-        print(f"Error: {churches_csv} not found")
+    if not churches_csv:
+        print("Error: churches_with_denominations.csv not found")
         return 1
     
-    if not os.path.exists(speakers_csv):
-        print(f"Error: {speakers_csv} not found")
+    if not speakers_csv:
+        print("Error: speakers.csv not found")
         return 1
     
     # Check database configuration
@@ -300,8 +388,9 @@ def main():
     
     # Test database connection
     try:
-        # Create database session
-        db = SessionLocal()
+        # Create database session; SessionLocal already disables autoflush, and nothing loaded
+        # before a commit is read again, so skip expiring (and re-fetching) it on commit
+        db = SessionLocal(expire_on_commit=False)
         # Test the connection
         db.execute(text("SELECT 1"))
         print("✅ Database connection successful")
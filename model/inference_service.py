@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import torch
-import pandas as pd
 import torch.nn.functional as F
+import pandas as pd
 
 from utils.save_or_load import load_artifacts
 from utils.model import build_mappings
+from utils.scoring import build_item_matrix, build_trait_index, candidates_to_device
 
-from ..app.models import schemas as models
+from app.db import models
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 # ---- Trait validation utilities (aligned with query_model) ----
@@ -62,6 +74,18 @@ CANONICAL_TRIPLES = {
 
 TRAIT_LIST = {_normalize_text(t) for triple in CANONICAL_TRIPLES for t in triple}
 
+# Candidate counts are padded up to one of these so the compiled scorer sees fixed shapes
+SCORE_BUCKETS = (1024, 2048, 4096, 8192)
+
+# Coalesce concurrent scoring requests into one GEMM: wait up to this long for a batch
+# to fill (0 disables batching, which is best for low traffic) and cap its size
+BATCH_MAX_WAIT_MS = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "0"))
+BATCH_MAX_SIZE = int(os.getenv("INFERENCE_BATCH_MAX_SIZE", "32"))
+
+# Ranked results are reused for identical (traits, swipes, filters, limit) requests
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL_SECONDS = 300
+
 
 def _validate_trait_values(traits: List[str]) -> None:
     if not traits:
@@ -72,6 +96,67 @@ def _validate_trait_values(traits: List[str]) -> None:
         raise ValueError(f"Unknown trait(s): {bad}")
 
 
+def _score_fn(V: torch.Tensor, q: torch.Tensor, inv_scale: float, bias: torch.Tensor) -> torch.Tensor:
+    return (V @ q) * inv_scale + bias
+
+
+class RequestBatcher:
+    """Scores queries from concurrent requests together with one [P, d] x [d, B] GEMM.
+
+    Each request still gets its own candidate filter and top-K; only the
+    matrix product against every pastor's item vector is shared.
+    """
+
+    def __init__(self, service: "ModelInferenceService", max_batch_size: int, max_wait_ms: float) -> None:
+        self._service = service
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[torch.Tensor, np.ndarray, int, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, query_vector: torch.Tensor, cand_idxs: np.ndarray, limit: int) -> Future:
+        future: Future = Future()
+        self._queue.put((query_vector, cand_idxs, limit, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._score_batch(batch)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    @torch.inference_mode()
+    def _score_batch(self, batch: List[Tuple[torch.Tensor, np.ndarray, int, Future]]) -> None:
+        svc = self._service
+        V_all = svc._V_all
+        Q = torch.stack([q.to(device=V_all.device, dtype=V_all.dtype) for q, _, _, _ in batch], dim=1)
+        scores = torch.addmm(svc._bias_all.unsqueeze(1), V_all, Q, alpha=1.0 / svc.model._scale).float()
+
+        for col, (_, cand_idxs, limit, future) in enumerate(batch):
+            cand_idx_t = torch.from_numpy(cand_idxs).to(V_all.device)
+            cand_scores = scores[:, col].index_select(0, cand_idx_t)
+            top_scores, top_pos = torch.topk(cand_scores, k=min(limit, cand_scores.numel()))
+            top_speaker_ids = svc._idx_to_sid_arr[cand_idxs[top_pos.cpu().numpy()]]
+            future.set_result([
+                (int(speaker_id), score)
+                for speaker_id, score in zip(top_speaker_ids.tolist(), top_scores.tolist())
+            ])
+
+
 class ModelInferenceService:
     """Loads model artifacts and exposes inference utilities.
 
@@ -87,6 +172,25 @@ class ModelInferenceService:
         self.pastor2idx: Optional[Dict[int, int]] = None
         self.trait2idx: Optional[Dict[str, int]] = None
         self.model_loaded: bool = False
+        # Reverse lookups, built once at load: internal pastor idx -> speaker_id, trait id -> token
+        self._idx_to_sid_arr: Optional[np.ndarray] = None
+        self._pastor_ids_tensor: Optional[torch.Tensor] = None  # CPU view of _idx_to_sid_arr
+        self._idx2trait: Dict[int, str] = {}
+        # key -> (stored_at, results); LRU-ordered, guarded by _result_cache_lock
+        self._result_cache: "OrderedDict[bytes, Tuple[float, List[Tuple[int, float]]]]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        # Per-thread pinned host buffer for candidate indices, only used on CUDA
+        self._pinned = threading.local()
+        # torch.compile'd _score_fn, specialized once per SCORE_BUCKETS size (CUDA only)
+        self._compiled_score_fn = None
+        self._batcher: Optional[RequestBatcher] = None
+        # Concatenated trait ids of every pastor plus per-pastor start/length (CSR), built once at load
+        self._flat_all: Optional[torch.Tensor] = None
+        self._starts_all: Optional[torch.Tensor] = None
+        self._lens_all: Optional[torch.Tensor] = None
+        # Item vectors and biases for every pastor; fixed for the lifetime of the loaded model
+        self._V_all: Optional[torch.Tensor] = None
+        self._bias_all: Optional[torch.Tensor] = None
 
         base_dir = Path(__file__).parent
         # Update to your preferred artifact directory
@@ -97,6 +201,10 @@ class ModelInferenceService:
     def _load_model(self, model_path: Path) -> None:
         try:
             self.model, self.user_enc, self.pastor_enc, self.pastor_trait_ids, _, _ = load_artifacts(self.model_path)
+            self.model.eval()
+            if next(self.model.parameters()).device.type == "cuda":
+                # bf16 halves embedding bandwidth; scores are cast back to fp32 before ranking
+                self.model = self.model.to(dtype=torch.bfloat16)
 
             # Rebuild mappings using the same sources used in training/querying
             data_dir = Path(__file__).parent / "data"
@@ -107,6 +215,15 @@ class ModelInferenceService:
                 rating_df = pd.read_csv(ratings_path)
                 pastor_df = pd.read_csv(pastor_path)
                 _, self.pastor2idx, self.trait2idx, _ = build_mappings(rating_df, pastor_df)
+                self._build_reverse_maps()
+                device = next(self.model.parameters()).device
+                self._flat_all, self._starts_all, self._lens_all = build_trait_index(self.pastor_trait_ids, device)
+                self._V_all, self._bias_all = build_item_matrix(self.model, self._flat_all, self._starts_all)
+                self._compile_score_fn()
+                if BATCH_MAX_WAIT_MS > 0:
+                    self._batcher = RequestBatcher(self, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS)
+                # Cached rankings came from the previous weights and mappings
+                self.clear_result_cache()
                 self.model_loaded = True
                 print(f"✅ Model loaded from {self.model_path}")
             else:
@@ -115,7 +232,30 @@ class ModelInferenceService:
             print(f"⚠️ Failed to load model artifacts from {self.model_path}: {e}")
             self.model_loaded = False
 
+    def _build_reverse_maps(self) -> None:
+        self._idx_to_sid_arr = np.zeros(len(self.pastor2idx), dtype=np.int64)
+        for speaker_id, idx in self.pastor2idx.items():
+            self._idx_to_sid_arr[idx] = speaker_id
+        self._pastor_ids_tensor = torch.from_numpy(self._idx_to_sid_arr)
+        self._idx2trait = {v: k for k, v in self.trait2idx.items()}
+
+    @torch.inference_mode()
+    def _compile_score_fn(self) -> None:
+        """Compile the scorer for every bucket up front so no request pays for tracing."""
+        if self._V_all.device.type != "cuda":
+            return
+        try:
+            fn = torch.compile(_score_fn, dynamic=False)
+            q = torch.zeros(self._V_all.shape[1], dtype=self._V_all.dtype, device=self._V_all.device)
+            for bucket in SCORE_BUCKETS:
+                idx = torch.zeros(bucket, dtype=torch.long, device=self._V_all.device)
+                fn(self._V_all.index_select(0, idx), q, 1.0 / self.model._scale, self._bias_all.index_select(0, idx))
+            self._compiled_score_fn = fn
+        except Exception as e:
+            print(f"⚠️ torch.compile unavailable, scoring eagerly: {e}")
+
     # ---------- Public API ----------
+    @torch.inference_mode()
     def generate_recommendations(
         self,
         user_preferences: Dict,
@@ -128,6 +268,13 @@ class ModelInferenceService:
         if not self.model_loaded:
             return []
 
+        cache_key = self._result_cache_key(
+            user_preferences, user_swipes, limit, exclude_speaker_ids, allowed_speaker_ids
+        )
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             device = next(self.model.parameters()).device
             d = self.model.user_embed.embedding_dim
@@ -144,19 +291,20 @@ class ModelInferenceService:
             alpha = 0.4
             q = (1 - alpha) * u + alpha * p
 
-            candidate_scores = self._score_candidates(
+            results = self._score_candidates(
                 q,
                 user_swipes or [],
+                limit,
                 exclude_speaker_ids=exclude_speaker_ids,
                 allowed_speaker_ids=allowed_speaker_ids,
             )
-
-            top_k = min(limit, len(candidate_scores))
-            return candidate_scores[:top_k]
+            self._store_cached_result(cache_key, results)
+            return results
         except Exception as e:
             print(f"Error during inference: {e}")
             return []
 
+    @torch.inference_mode()
     def generate_recommendations_detailed(
         self,
         user_preferences: Dict,
@@ -188,16 +336,17 @@ class ModelInferenceService:
             alpha = 0.4
             q = (1 - alpha) * u + alpha * p
 
-            results = self._score_candidates(
+            top_k = self._score_candidates(
                 q,
                 user_swipes or [],
+                limit,
                 exclude_speaker_ids=exclude_speaker_ids,
                 allowed_speaker_ids=allowed_speaker_ids,
             )
-
-            top_k = results[: min(limit, len(results))]
             # Mirror query_model: map trait ids back to readable tokens
-            idx2trait = {v: k for k, v in (self.trait2idx or {}).items()}
+            idx2trait = self._idx2trait
+            # Norm of the preference vector is shared by every item's content cosine
+            p_norm = p.norm().clamp_min(1e-8)
             detailed: List[Dict[str, Any]] = []
             for speaker_id, score in top_k:
                 internal_idx = None
@@ -207,14 +356,16 @@ class ModelInferenceService:
                     continue
 
                 f_ids = self.pastor_trait_ids[internal_idx].to(device)
-                v_feat = self.model.trait_bag.weight[f_ids].mean(0)
-                content_cosine = float(F.cosine_similarity(p.unsqueeze(0), v_feat.unsqueeze(0), dim=1).item())
-
-                trait_align: List[Tuple[str, float]] = []
-                for fid in f_ids.tolist():
-                    token = idx2trait.get(fid, f"fid:{fid}")
-                    align_score = float(torch.dot(p, self.model.trait_bag.weight[fid]).item())
-                    trait_align.append((token, align_score))
+                trait_vecs = self.model.trait_bag.weight[f_ids]
+                v_feat = trait_vecs.mean(0)
+                content_cosine = float(torch.dot(p, v_feat) / (p_norm * v_feat.norm().clamp_min(1e-8)))
+
+                # One matvec for every trait's alignment instead of a dot per trait
+                align_scores = (trait_vecs @ p).tolist()
+                trait_align: List[Tuple[str, float]] = [
+                    (idx2trait.get(fid, f"fid:{fid}"), align_score)
+                    for fid, align_score in zip(f_ids.tolist(), align_scores)
+                ]
                 trait_align.sort(key=lambda x: x[1], reverse=True)
                 top_trait_explanations = [t for t, _ in trait_align[:3]]
 
@@ -250,30 +401,72 @@ class ModelInferenceService:
         speaker_ids = [int(rec[0]) for rec in speaker_recommendations]
         scores = [float(rec[1]) for rec in speaker_recommendations]
         
-        # Check if recommendations already exist for this user
-        existing = db.query(models.Recommendations).filter(
-            models.Recommendations.user_id == user_id
-        ).first()
+        # Insert or overwrite in one round trip, returning the stored row
+        stmt = pg_insert(models.Recommendations).values(
+            user_id=user_id,
+            speaker_ids=speaker_ids,
+            scores=scores
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_user_recommendations',
+            set_={
+                'speaker_ids': stmt.excluded.speaker_ids,
+                'scores': stmt.excluded.scores,
+                'updated_at': func.now()  # onupdate doesn't fire for ON CONFLICT
+            }
+        ).returning(models.Recommendations)
         
-        if existing:
-            # Update existing recommendations
-            existing.speaker_ids = speaker_ids
-            existing.scores = scores
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            # Create new recommendations
-            new_recommendations = models.Recommendations(
-                user_id=user_id,
-                speaker_ids=speaker_ids,
-                scores=scores
-            )
-            db.add(new_recommendations)
-            db.commit()
-            db.refresh(new_recommendations)
-            return new_recommendations
+        stored = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+        db.commit()
+        return stored
+
+    def clear_result_cache(self) -> None:
+        """Drop every cached ranking; the cache key covers a request's inputs but not the loaded model."""
+        with self._result_cache_lock:
+            self._result_cache.clear()
+
     # ---------- Internal helpers ----------
+    @staticmethod
+    def _result_cache_key(
+        user_preferences: Dict,
+        user_swipes: Optional[List[Dict]],
+        limit: int,
+        exclude_speaker_ids: Optional[Iterable[int]],
+        allowed_speaker_ids: Optional[Iterable[int]],
+    ) -> bytes:
+        """Stable hash of everything that affects the ranking (trait order and swipe order do not)."""
+        payload = json.dumps({
+            "traits": sorted(user_preferences.get("trait_choices", [])),
+            "swipes": sorted(
+                (int(s.get("speaker_id", 0)), float(s.get("rating", 0))) for s in user_swipes or []
+            ),
+            "limit": limit,
+            "exclude": sorted(int(i) for i in exclude_speaker_ids or []),
+            "allowed": sorted(int(i) for i in allowed_speaker_ids or []),
+        })
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def _get_cached_result(self, key: bytes) -> Optional[List[Tuple[int, float]]]:
+        with self._result_cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > RESULT_CACHE_TTL_SECONDS:
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+            return list(results)
+
+    def _store_cached_result(self, key: bytes, results: List[Tuple[int, float]]) -> None:
+        if not results:
+            return
+        with self._result_cache_lock:
+            self._result_cache[key] = (time.monotonic(), list(results))
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
     def _traits_to_trait_ids(self, traits: List[str]) -> List[int]:
         """Resolve trait selections to trained IDs when training used value-only tokens.
 
@@ -326,38 +519,36 @@ class ModelInferenceService:
 
     def _build_behavior_vector(self, user_swipes: List[Dict], device) -> torch.Tensor:
         d = self.model.user_embed.embedding_dim
-        liked_vs: List[torch.Tensor] = []
-        disliked_vs: List[torch.Tensor] = []
-
+        pastor_idxs: List[int] = []
+        liked: List[bool] = []
         for swipe in user_swipes:
-            speaker_id = int(swipe.get("speaker_id", 0))
-            rating = float(swipe.get("rating", 0))
-
-            if not self.pastor2idx or speaker_id not in self.pastor2idx:
+            idx = (self.pastor2idx or {}).get(int(swipe.get("speaker_id", 0)))
+            if idx is None:
                 continue
+            pastor_idxs.append(idx)
+            liked.append(float(swipe.get("rating", 0)) >= 4.0)
 
-            idx = self.pastor2idx[speaker_id]
-            v_id = self.model.pastor_id_emb.weight[idx]
-            f_ids = self.pastor_trait_ids[idx].to(device)
-            v_feat = self.model.trait_bag.weight[f_ids].mean(0)
-            v = v_id + v_feat
+        if not pastor_idxs:
+            return torch.zeros(d, device=device)
 
-            if rating >= 4.0:
-                liked_vs.append(v)
-            else:
-                disliked_vs.append(v)
+        # One gather of the precomputed item vectors (pastor_id_emb + mean trait bag) for every swipe
+        idx_t = torch.tensor(pastor_idxs, dtype=torch.long, device=device)
+        liked_mask = torch.tensor(liked, dtype=torch.bool, device=device)
+        V = F.embedding(idx_t, self._V_all)
 
-        v_like = torch.stack(liked_vs, dim=0).mean(0) if liked_vs else torch.zeros(d, device=device)
-        v_dis = torch.stack(disliked_vs, dim=0).mean(0) if disliked_vs else torch.zeros(d, device=device)
+        v_like = V[liked_mask].mean(0) if any(liked) else torch.zeros(d, device=device)
+        v_dis = V[~liked_mask].mean(0) if not all(liked) else torch.zeros(d, device=device)
         return v_like - 0.5 * v_dis
 
     def _score_candidates(
         self,
         query_vector: torch.Tensor,
         user_swipes: List[Dict],
+        limit: int,
         exclude_speaker_ids: Optional[Iterable[int]] = None,
         allowed_speaker_ids: Optional[Iterable[int]] = None,
     ) -> List[Tuple[int, float]]:
+        """Top `limit` (speaker_id, score) pairs, best first."""
         device = query_vector.device
 
         swiped_ids = {int(s.get("speaker_id", 0)) for s in user_swipes}
@@ -367,53 +558,50 @@ class ModelInferenceService:
         if not self.pastor2idx:
             return []
 
-        cand_idxs: List[int] = []
-        cand_speaker_ids: List[int] = []
-        for speaker_id, idx in self.pastor2idx.items():
-            if speaker_id in exclude:
-                continue
-            if allow and speaker_id not in allow:
-                continue
-            cand_idxs.append(idx)
-            cand_speaker_ids.append(speaker_id)
+        # Vectorized candidate filter over every pastor, aligned with internal pastor indices
+        keep = ~torch.isin(self._pastor_ids_tensor, torch.tensor(list(exclude), dtype=torch.long))
+        if allow:
+            keep &= torch.isin(self._pastor_ids_tensor, torch.tensor(list(allow), dtype=torch.long))
+        cand_idxs_np = torch.nonzero(keep).flatten().numpy()
 
-        if not cand_idxs:
+        if cand_idxs_np.size == 0:
             return []
+        if self._batcher is not None:
+            return self._batcher.submit(query_vector, cand_idxs_np, limit).result()
+
+        cand_idx_t = candidates_to_device(cand_idxs_np, device, self._pinned, len(self._idx_to_sid_arr))
+
+        # Gather precomputed item vectors and biases; scoring is a single matvec
+        n = cand_idxs_np.size
+        bucket = next((b for b in SCORE_BUCKETS if b >= n), None)
+        if self._compiled_score_fn is not None and bucket is not None:
+            # Pad with row 0 up to the bucket size, then drop the padded scores
+            padded_idx_t = F.pad(cand_idx_t, (0, bucket - n))
+            V = self._V_all.index_select(0, padded_idx_t)
+            bias = self._bias_all.index_select(0, padded_idx_t)
+            scores = self._compiled_score_fn(V, query_vector.to(V.dtype), 1.0 / self.model._scale, bias)[:n].float()
+        else:
+            V = self._V_all.index_select(0, cand_idx_t)
+            bias = self._bias_all.index_select(0, cand_idx_t)
+            scores = torch.addmv(bias, V, query_vector.to(V.dtype), alpha=1.0 / self.model._scale).float()
 
-        cand_idx_t = torch.tensor(cand_idxs, dtype=torch.long, device=device)
-
-        flat: List[int] = []
-        offsets: List[int] = [0]
-        total = 0
-        for i in cand_idxs:
-            f = self.pastor_trait_ids[i].tolist()
-            flat.extend(f)
-            total += len(f)
-            offsets.append(total)
-
-        flat_t = torch.tensor(flat, dtype=torch.long, device=device)
-        offsets_t = torch.tensor(offsets[:-1], dtype=torch.long, device=device)
-
-        v_id = self.model.pastor_id_emb(cand_idx_t)
-        v_feat = self.model.trait_bag(flat_t, offsets_t)
-        V = v_id + v_feat
-
-        dot = (V * query_vector.unsqueeze(0)).sum(-1) / self.model._scale
-        bias = self.model.global_bias + self.model.pastor_bias(cand_idx_t).squeeze(-1)
-        scores = (dot + bias).detach().cpu()
-
-        results = [(int(cand_speaker_ids[i]), float(scores[i])) for i in range(len(cand_speaker_ids))]
-        return sorted(results, key=lambda x: x[1], reverse=True)
+        # Partial sort on device; only the top K cross over to Python
+        top_scores, top_pos = torch.topk(scores, k=min(limit, scores.numel()))
+        top_speaker_ids = self._idx_to_sid_arr[cand_idxs_np[top_pos.cpu().numpy()]]
+        return [(int(speaker_id), score) for speaker_id, score in zip(top_speaker_ids.tolist(), top_scores.tolist())]
 
 
 # Global singleton instance
 _global_service: Optional[ModelInferenceService] = None
+_global_service_lock = threading.Lock()
 
 
 def get_model_service() -> ModelInferenceService:
     global _global_service
     if _global_service is None:
-        _global_service = ModelInferenceService()
+        with _global_service_lock:
+            if _global_service is None:
+                _global_service = ModelInferenceService()
     return _global_service
 
 
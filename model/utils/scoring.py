@@ -0,0 +1,50 @@
+import threading
+from typing import List, Tuple
+
+import numpy as np
+import torch
+
+
+# Shared by ModelInferenceService and the app's MLRecommendationService, which both
+# score a query vector against every pastor's precomputed item vector
+
+def build_trait_index(pastor_trait_ids: List[torch.Tensor], device) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Flatten per-pastor trait ids once (CSR) so trait bags never need a per-pastor Python loop.
+
+    Returns (flat trait ids, per-pastor start offsets, per-pastor lengths).
+    """
+    lens = torch.tensor([len(ids) for ids in pastor_trait_ids], dtype=torch.long, device=device)
+    starts = torch.cumsum(lens, 0) - lens
+    flat = torch.cat([ids.to(device=device, dtype=torch.long) for ids in pastor_trait_ids])
+    return flat, starts, lens
+
+
+@torch.no_grad()
+def build_item_matrix(model, flat: torch.Tensor, starts: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Precompute V = pastor_id_emb + mean(trait_bag) and the bias for every pastor.
+
+    Returns (V_all [P, d], bias_all [P]).
+    """
+    all_idx = torch.arange(starts.numel(), device=flat.device)
+    v_feat = model.trait_bag(flat, starts)
+    V_all = (model.pastor_id_emb(all_idx) + v_feat).contiguous()
+    bias_all = model.global_bias + model.pastor_bias(all_idx).squeeze(-1)
+    return V_all, bias_all
+
+
+def candidates_to_device(cand_idxs: np.ndarray, device: torch.device, pinned: threading.local, capacity: int) -> torch.Tensor:
+    """Move candidate indices to device; on CUDA, stage them in pinned memory for an async copy.
+
+    pinned holds one host buffer of `capacity` indices per thread, allocated on first use.
+    """
+    if device.type != "cuda":
+        return torch.from_numpy(cand_idxs)
+
+    # One buffer per thread: the copy is only known to be done once scoring syncs on .cpu()
+    buf = getattr(pinned, "cand_idx", None)
+    if buf is None:
+        buf = torch.empty(capacity, dtype=torch.long, pin_memory=True)
+        pinned.cand_idx = buf
+    staged = buf[:cand_idxs.size]
+    staged.copy_(torch.from_numpy(cand_idxs))
+    return staged.to(device, non_blocking=True)
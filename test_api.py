@@ -4,32 +4,62 @@ Simple test script to verify the API endpoints are working.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 import json
+import orjson
 
 BASE_URL = "http://localhost:8000"
 
+def create_session() -> requests.Session:
+    """Session whose keep-alive connection is reused by every request below"""
+    session = requests.Session()
+    # Transient gateway errors are retried with backoff (honouring Retry-After) over the
+    # same pooled connections instead of failing the whole run. Only urllib3's default
+    # idempotent methods are retried; a retried POST could create its records twice
+    retry = Retry(
+        total=3,
+        backoff_factor=0.25,
+        status_forcelist=[502, 503, 504],
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive", "Accept": "application/json"})
+    return session
+
 def test_endpoints():
     """Test basic API endpoints"""
     print("🧪 Testing FastAPI CMS endpoints...")
+    session = create_session()
     
     # Test health check
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = session.get(f"{BASE_URL}/health")
         print(f"✅ Health check: {response.status_code} - {response.json()}")
     except Exception as e:
         print(f"❌ Health check failed: {e}")
         return
     
+    # The remaining endpoints don't depend on each other, so request them all at once
+    # and report the results in their usual order
+    paths = ["/", "/api/v1/churches/", "/api/v1/speakers/", "/api/v1/onboarding/questions"]
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        pending = [pool.submit(session.get, f"{BASE_URL}{path}") for path in paths]
+    root_request, churches_request, speakers_request, questions_request = pending
+    
     # Test root endpoint
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = root_request.result()
         print(f"✅ Root endpoint: {response.status_code} - {response.json()}")
     except Exception as e:
         print(f"❌ Root endpoint failed: {e}")
     
     # Test churches endpoint
     try:
-        response = requests.get(f"{BASE_URL}/api/v1/churches/")
+        response = churches_request.result()
         print(f"✅ Churches endpoint: {response.status_code}")
         if response.status_code == 200:
             churches = response.json()
@@ -41,7 +71,7 @@ def test_endpoints():
     
     # Test speakers endpoint
     try:
-        response = requests.get(f"{BASE_URL}/api/v1/speakers/")
+        response = speakers_request.result()
         print(f"✅ Speakers endpoint: {response.status_code}")
         if response.status_code == 200:
             speakers = response.json()
@@ -53,14 +83,32 @@ def test_endpoints():
     
     # Test onboarding questions
     try:
-        response = requests.get(f"{BASE_URL}/api/v1/onboarding/questions")
+        response = questions_request.result()
         print(f"✅ Onboarding questions: {response.status_code}")
         if response.status_code == 200:
             questions = response.json()
             print(f"   Found {len(questions)} questions")
+            
+            # Revalidating with the ETag should skip the body
+            etag = response.headers.get("ETag")
+            if etag:
+                response = session.get(f"{BASE_URL}/api/v1/onboarding/questions", headers={"If-None-Match": etag})
+                print(f"✅ Onboarding questions revalidated: {response.status_code}")
     except Exception as e:
         print(f"❌ Onboarding questions failed: {e}")
     
+    # Test streamed recommendations for the first user, parsing each line as it arrives
+    try:
+        users = session.get(f"{BASE_URL}/api/v1/users/", params={"limit": 1}).json()
+        if users:
+            url = f"{BASE_URL}/api/v1/onboarding/recommendations/{users[0]['id']}"
+            with session.get(url, headers={"Accept": "application/x-ndjson"}, stream=True) as response:
+                print(f"✅ Streamed recommendations: {response.status_code}")
+                sermons = [orjson.loads(line) for line in response.iter_lines() if line]
+                print(f"   Received {len(sermons)} sermons")
+    except Exception as e:
+        print(f"❌ Streamed recommendations failed: {e}")
+    
     print("\n🎉 API testing completed!")
 
 if __name__ == "__main__":